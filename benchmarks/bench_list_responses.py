@@ -0,0 +1,103 @@
+"""Benchmark: per-request CPU spent encoding a 500-item shopping list response.
+
+Compares what FastAPI does when an endpoint with
+``response_model=List[Dict[str, Any]]`` returns the list with the
+FastJSONResponse fast path the API now uses, and shows what compression costs
+and saves on the same payload. FastAPI validates the list against the
+response model either way; releases before the ``dump_json`` fast path then
+dump it to Python objects and encode them with the stdlib json module, newer
+ones serialize the validated value straight to JSON in pydantic-core. Both
+are measured, and the speedup is reported against the one the installed
+FastAPI uses. Routing, dependency resolution and the rest of the request are
+not included.
+
+Usage:
+  python benchmarks/bench_list_responses.py [item_count]
+"""
+
+import gzip
+import os
+import sys
+import time
+import uuid
+from typing import Any, Callable, Dict, List
+
+import inspect
+
+import brotli
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from pydantic import TypeAdapter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.api.responses import FastJSONResponse  # noqa: E402
+
+ITERATIONS = 200
+
+
+def make_items(count: int) -> List[Dict[str, Any]]:
+    """Builds item dicts shaped like Amazon's getlistitems entries."""
+    return [
+        {
+            "id": str(uuid.uuid4()),
+            "value": f"item number {i}",
+            "completed": i % 3 == 0,
+            "listId": "a1b2c3d4-list",
+            "customerId": "A1CUSTOMER",
+            "type": "TASK",
+            "version": i % 7 + 1,
+            "createdDateTime": 1700000000000 + i,
+            "updatedDateTime": 1700000500000 + i,
+            "shoppingListItem": True,
+            "nbestItems": None,
+        }
+        for i in range(count)
+    ]
+
+
+def cpu_time_per_call(fn: Callable[[], Any]) -> float:
+    """Returns the average process CPU time of one call, in microseconds."""
+    fn()  # Warm-up
+    start = time.process_time()
+    for _ in range(ITERATIONS):
+        fn()
+    return (time.process_time() - start) / ITERATIONS * 1e6
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    items = make_items(count)
+    response_adapter = TypeAdapter(List[Dict[str, Any]])
+
+    def stdlib_path() -> bytes | memoryview:
+        # FastAPI without dump_json: validate, dump to Python objects, json.dumps in JSONResponse
+        validated = response_adapter.validate_python(items)
+        return JSONResponse(response_adapter.dump_python(validated, mode="json")).body
+
+    def dump_json_path() -> bytes:
+        # FastAPI with dump_json: validate, then serialize straight to JSON bytes
+        return response_adapter.dump_json(response_adapter.validate_python(items))
+
+    def fast_path() -> bytes | memoryview:
+        return FastJSONResponse(items).body
+
+    body = fast_path()
+    stdlib_us = cpu_time_per_call(stdlib_path)
+    dump_json_us = cpu_time_per_call(dump_json_path)
+    fast_us = cpu_time_per_call(fast_path)
+    uses_dump_json = "dump_json" in inspect.signature(serialize_response).parameters
+    default_us = dump_json_us if uses_dump_json else stdlib_us
+    gzip_us = cpu_time_per_call(lambda: gzip.compress(body, compresslevel=9))
+    brotli_us = cpu_time_per_call(lambda: brotli.compress(body, quality=4, mode=brotli.MODE_TEXT))
+
+    print(f"{count}-item list, {len(body):,} bytes uncompressed, {ITERATIONS} iterations")
+    print(f"  response_model, validate + stdlib json:       {stdlib_us:10.1f} us/request{'' if uses_dump_json else '  <- installed FastAPI'}")
+    print(f"  response_model, validate + dump_json:         {dump_json_us:10.1f} us/request{'  <- installed FastAPI' if uses_dump_json else ''}")
+    print(f"  FastJSONResponse (orjson):                    {fast_us:10.1f} us/request")
+    print(f"  CPU saved per request vs installed FastAPI:    {default_us - fast_us:10.1f} us ({default_us / fast_us:.1f}x faster)")
+    print(f"  gzip (level 9):   {gzip_us:10.1f} us, {len(gzip.compress(body, compresslevel=9)):,} bytes")
+    print(f"  brotli (q4):      {brotli_us:10.1f} us, {len(brotli.compress(body, quality=4)):,} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,27 @@
 """Functions for interacting with the Alexa API (shopping list)."""
 
+import hashlib
 import json
 import logging
+import os
+import random
+import re
+import threading
+import time
+import unicodedata
 import requests
+from requests.adapters import HTTPAdapter
+from requests.cookies import RequestsCookieJar
+from urllib3.exceptions import ConnectTimeoutError, NewConnectionError
+from email.utils import parsedate_to_datetime
 from http.cookies import SimpleCookie
+from http.cookiejar import Cookie, CookieJar
 from collections import defaultdict
 from typing import Optional, List, Dict, Any
 
 # Import the local config module itself
 from . import config as api_config
+from .list_mirror import ListMirror
 
 logger = logging.getLogger(__name__)
 
@@ -24,10 +37,7 @@ DEFAULT_HEADERS = {
 }
 
 # --- Cookie Handling ---
-
-# Hardcoded path for cookie loading *within the container*
-# Adjusted for JSON format
-CONTAINER_COOKIE_PATH = "/app/data/cookies.json"
+# Cookie files are JSON lists of cookie dicts; see AccountRegistry for their paths.
 
 def load_cookies_from_json_file(cookie_file_path: str) -> Optional[List[Dict[str, Any]]]:
     """Loads cookies from a JSON file (expected list of dicts)."""
@@ -53,71 +63,529 @@ def load_cookies_from_json_file(cookie_file_path: str) -> Optional[List[Dict[str
         logger.error(f"Failed to load or parse cookies from JSON file {cookie_file_path}: {err}", exc_info=True)
         return None
 
+def build_cookie_jar(cookie_list_of_dicts: List[Dict[str, Any]]) -> RequestsCookieJar:
+    """Builds a cookie jar from a list of cookie dicts (as saved by the login script)."""
+    jar = RequestsCookieJar()
+    for cookie_dict in cookie_list_of_dicts:
+        name = cookie_dict.get('name')
+        value = cookie_dict.get('value')
+        domain = cookie_dict.get('domain')
+        path = cookie_dict.get('path')
+
+        if name and value:
+            logger.debug(f"Setting cookie: name={name}, domain={domain}, path={path}")
+            # requests automatically handles secure/expires/httpOnly for its context
+            # We mainly need name, value, domain, path for session management
+            jar.set(name=name, value=value, domain=domain or '', path=path or '/')
+        else:
+            logger.warning(f"Skipping cookie dict with missing name/value: {cookie_dict}")
+    return jar
+
+def _same_cookie(a: Cookie, name: str, domain: str, path: str) -> bool:
+    return a.name == name and a.path == path and a.domain.lstrip('.') == domain.lstrip('.')
+
+class CookieStore:
+    """Keeps the parsed cookie jar in memory and reloads it only when the cookie file changes.
+
+    Changes are detected by comparing the file's inode, mtime and size on each
+    access, which costs a single ``stat`` instead of a read and JSON parse.
+
+    Cookies Amazon sets in responses (session token rotation and the like) are
+    merged into the jar at once and written back to the file after
+    persist_delay_seconds, so bursts of refreshes cost a single write.
+    """
+
+    def __init__(self, cookie_file_path: str, persist_delay_seconds: float = 0.0):
+        self.cookie_file_path = cookie_file_path
+        self.persist_delay_seconds = persist_delay_seconds
+        self.refreshed = 0
+        self.persisted = 0
+        self._jar: Optional[RequestsCookieJar] = None
+        self._signature: Optional[tuple] = None
+        self._pending: Dict[tuple, Cookie] = {}
+        self._persist_timer: Optional[threading.Timer] = None
+        self._lock = threading.Lock()
+
+    def _file_signature(self) -> Optional[tuple]:
+        try:
+            stat = os.stat(self.cookie_file_path)
+        except OSError:
+            return None
+        return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+    def get_jar(self) -> Optional[RequestsCookieJar]:
+        """Returns the current cookie jar, reloading it first if the file changed."""
+        signature = self._file_signature()
+        if signature != self._signature:
+            with self._lock:
+                if signature != self._signature:
+                    self._reload(signature)
+        return self._jar
+
+    def _reload(self, signature: Optional[tuple]) -> None:
+        self._signature = signature
+        self._pending.clear()  # The file on disk supersedes refreshes not yet written
+        if signature is None:
+            logger.debug(f"Cookie file {self.cookie_file_path} is missing; clearing in-memory cookies.")
+            self._jar = None
+            return
+        cookie_list_of_dicts = load_cookies_from_json_file(self.cookie_file_path)
+        self._jar = build_cookie_jar(cookie_list_of_dicts) if cookie_list_of_dicts else None
+        logger.info(f"Loaded cookies from {self.cookie_file_path} into memory.")
+
+    def replace(self, cookie_list_of_dicts: List[Dict[str, Any]]) -> None:
+        """Hot-swaps the in-memory jar, e.g. after new cookies were received and saved."""
+        jar = build_cookie_jar(cookie_list_of_dicts)
+        with self._lock:
+            self._jar = jar
+            # Record the file as already loaded so the next access does not re-parse it
+            self._signature = self._file_signature()
+            self._pending.clear()
+        logger.info(f"Replaced in-memory cookie jar ({len(jar)} cookies).")
+
+    def merge_response_cookies(self, cookies: CookieJar) -> None:
+        """Applies cookies set by an Amazon response to the jar and schedules the cookie file update."""
+        changed = 0
+        with self._lock:
+            if self._jar is None:
+                return
+            for cookie in cookies:
+                if not cookie.value:
+                    continue
+                current = [c for c in self._jar if _same_cookie(c, cookie.name, cookie.domain, cookie.path)]
+                if any(c.value == cookie.value for c in current):
+                    continue
+                for c in current:
+                    self._jar.clear(c.domain, c.path, c.name)
+                self._jar.set_cookie(cookie)
+                self._pending[(cookie.name, cookie.domain.lstrip('.'), cookie.path)] = cookie
+                changed += 1
+            if changed and self._persist_timer is None:
+                self._persist_timer = threading.Timer(self.persist_delay_seconds, self.flush)
+                self._persist_timer.daemon = True
+                self._persist_timer.start()
+        if changed:
+            self.refreshed += changed
+            logger.info(f"Amazon refreshed {changed} cookie(s) for {self.cookie_file_path}.")
+
+    def flush(self) -> None:
+        """Writes refreshed cookies to the cookie file now (atomically, via a temporary file and rename)."""
+        with self._lock:
+            timer, self._persist_timer = self._persist_timer, None
+            if timer is not None:
+                timer.cancel()
+            pending, self._pending = self._pending, {}
+            if not pending:
+                return
+            if self._file_signature() != self._signature:
+                logger.info(f"Cookie file {self.cookie_file_path} changed on disk; not writing refreshed cookies over it.")
+                return
+            cookie_list = load_cookies_from_json_file(self.cookie_file_path) or []
+            for cookie in pending.values():
+                entry: Optional[Dict[str, Any]] = next(
+                    (c for c in cookie_list if c.get('name') == cookie.name and (c.get('path') or '/') == cookie.path
+                     and (c.get('domain') or '').lstrip('.') == cookie.domain.lstrip('.')),
+                    None
+                )
+                if entry is None:
+                    entry = {'name': cookie.name, 'domain': cookie.domain, 'path': cookie.path}
+                    cookie_list.append(entry)
+                entry['value'] = cookie.value
+                entry['expires'] = cookie.expires
+                entry['secure'] = bool(cookie.secure)
+            temp_path = f"{self.cookie_file_path}.tmp"
+            try:
+                with open(temp_path, 'w', encoding='utf-8') as f:
+                    json.dump(cookie_list, f, indent=2)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(temp_path, self.cookie_file_path)
+            except OSError as err:
+                logger.error(f"Failed to persist refreshed cookies to {self.cookie_file_path}: {err}")
+                return
+            self._signature = self._file_signature()
+            self.persisted += 1
+        logger.info(f"Persisted {len(pending)} refreshed cookie(s) to {self.cookie_file_path}.")
+
+    def stats(self) -> Dict[str, Any]:
+        return {"refreshed": self.refreshed, "persisted": self.persisted, "pending": len(self._pending)}
+
+# --- HTTP Client ---
+class AlexaClient:
+    """Long-lived HTTP client for Amazon requests.
+
+    Holds a single ``requests.Session`` with a sized connection pool so that
+    keep-alive connections (and their TLS sessions) are reused across calls.
+    """
+
+    def __init__(
+        self,
+        pool_connections: int,
+        pool_maxsize: int,
+        connect_timeout: float,
+        read_timeout: float
+    ):
+        self.timeout = (connect_timeout, read_timeout)
+        self.session = requests.Session()
+        self.session.headers.update(DEFAULT_HEADERS)
+        # Retries are handled by the caller; the adapter only manages the pool
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            max_retries=0
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        payload: Optional[Dict[str, Any]] = None,
+        cookies: Optional[RequestsCookieJar] = None
+    ) -> requests.Response:
+        """Sends a request over the pooled session using the configured timeouts."""
+        return self.session.request(method, url, json=payload, cookies=cookies, timeout=self.timeout)
+
+    def close(self) -> None:
+        """Closes all pooled connections."""
+        self.session.close()
+
+# One client per account: the session keeps cookies Amazon sets in responses,
+# so accounts must not share one.
+_clients: Dict[str, AlexaClient] = {}
+_client_lock = threading.Lock()
+
+def get_alexa_client(account: 'Account') -> AlexaClient:
+    """Returns the account's Alexa client, creating it on first use."""
+    client = _clients.get(account.account_id)
+    if client is None:
+        with _client_lock:
+            client = _clients.get(account.account_id)
+            if client is None:
+                client = AlexaClient(
+                    pool_connections=api_config.HTTP_POOL_CONNECTIONS,
+                    pool_maxsize=api_config.HTTP_POOL_MAXSIZE,
+                    connect_timeout=api_config.HTTP_CONNECT_TIMEOUT,
+                    read_timeout=api_config.HTTP_READ_TIMEOUT
+                )
+                _clients[account.account_id] = client
+                logger.debug(f"Created pooled Alexa HTTP client for account '{account.account_id}'.")
+    return client
+
+def close_alexa_clients() -> None:
+    """Closes every Alexa client created so far."""
+    with _client_lock:
+        for client in _clients.values():
+            client.close()
+        _clients.clear()
+
+# --- Rate Limiting & Retries ---
+class TokenBucket:
+    """Token-bucket rate limiter for one account's Amazon calls.
+
+    ``reserve`` takes a token and returns how long the caller must wait before
+    sending, so the same limiter paces both sync (time.sleep) and async
+    (asyncio.sleep) callers.
+    """
+
+    def __init__(self, rate_per_second: float, burst: int):
+        self.rate_per_second = rate_per_second
+        self.burst = max(1, burst)
+        self.acquired = 0
+        self.delayed = 0
+        self.total_wait_seconds = 0.0
+        self._tokens = float(self.burst)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Takes a token and returns the number of seconds to wait before using it."""
+        if self.rate_per_second <= 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate_per_second)
+            self._last = now
+            self._tokens -= 1
+            self.acquired += 1
+            if self._tokens >= 0:
+                return 0.0
+            # Negative tokens are debt owed by callers already queued ahead of us
+            wait = -self._tokens / self.rate_per_second
+            self.delayed += 1
+            self.total_wait_seconds += wait
+            return wait
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "rate_per_second": self.rate_per_second,
+                "burst": self.burst,
+                "acquired": self.acquired,
+                "delayed": self.delayed,
+                "total_wait_seconds": round(self.total_wait_seconds, 3)
+            }
+
+# Statuses for which Amazon rejected the request without processing it
+REJECTED_STATUS_CODES = (429, 503)
+# Statuses that may be transient but where the request might have been processed
+TRANSIENT_STATUS_CODES = (500, 502, 504)
+# Never retried: the cookies are invalid and retrying cannot help
+AUTH_FAILURE_STATUS_CODES = (401, 403)
+IDEMPOTENT_METHODS = ('GET', 'PUT', 'DELETE')
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parses a Retry-After header (delta-seconds or HTTP date) into seconds."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+class RetryPolicy:
+    """Classifies failed Amazon calls and computes jittered exponential backoff delays.
+
+    Error kinds are 'connect' (the request never reached Amazon), 'timeout'
+    (no response in time) and 'transport' (connection broke mid-exchange).
+    Only idempotent methods are retried when the request may have been processed.
+    """
+
+    def __init__(self, max_retries: int, base_delay: float, max_delay: float):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retries = 0
+        self.gave_up = 0
+        self.retry_after_honored = 0
+        self._lock = threading.Lock()
+
+    def _backoff(self, attempt: int, retry_after: Optional[float] = None) -> Optional[float]:
+        with self._lock:
+            if retry_after is not None:
+                if retry_after > self.max_delay:
+                    # Retrying sooner than Amazon asked would only be rejected again
+                    self.gave_up += 1
+                    return None
+                self.retries += 1
+                self.retry_after_honored += 1
+                return retry_after
+            self.retries += 1
+        # Full jitter keeps concurrent retries from arriving in lockstep
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    def _give_up(self) -> None:
+        with self._lock:
+            self.gave_up += 1
+
+    def delay_for_status(self, method: str, status_code: int, retry_after: Optional[str], attempt: int) -> Optional[float]:
+        """Returns how long to wait before retrying a failed response, or None to give up."""
+        if status_code in AUTH_FAILURE_STATUS_CODES:
+            return None
+        retryable = status_code in REJECTED_STATUS_CODES or (
+            status_code in TRANSIENT_STATUS_CODES and method in IDEMPOTENT_METHODS
+        )
+        if not retryable:
+            return None
+        if attempt >= self.max_retries:
+            self._give_up()
+            return None
+        return self._backoff(attempt, parse_retry_after(retry_after))
+
+    def delay_for_error(self, method: str, error_kind: str, attempt: int) -> Optional[float]:
+        """Returns how long to wait before retrying after a transport error, or None to give up."""
+        if error_kind != 'connect' and method not in IDEMPOTENT_METHODS:
+            return None
+        if attempt >= self.max_retries:
+            self._give_up()
+            return None
+        return self._backoff(attempt)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "max_retries": self.max_retries,
+                "retries": self.retries,
+                "gave_up": self.gave_up,
+                "retry_after_honored": self.retry_after_honored
+            }
+
+retry_policy = RetryPolicy(
+    api_config.UPSTREAM_MAX_RETRIES,
+    api_config.UPSTREAM_RETRY_BASE_DELAY,
+    api_config.UPSTREAM_RETRY_MAX_DELAY
+)
+
+# --- Auth Circuit Breaker ---
+class AuthenticationRequiredError(Exception):
+    """Raised when Amazon calls cannot succeed until new cookies are provided."""
+
+class AuthCircuitBreaker:
+    """Stops sending requests to Amazon once the cookies have been rejected.
+
+    States: 'closed' (normal), 'open' (fail fast) and 'half_open' (a single probe
+    request is in flight after the probe interval elapsed). A successful probe
+    closes the breaker, an auth failure re-opens it, and ``reset`` closes it
+    immediately when new cookies arrive.
+    """
+
+    def __init__(self, probe_interval_seconds: float, name: str = 'default'):
+        self.probe_interval_seconds = probe_interval_seconds
+        self.name = name
+        self.state = 'closed'
+        self.trips = 0
+        self.fast_failures = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def before_request(self) -> bool:
+        """Raises AuthenticationRequiredError unless this request may be sent; returns True if it is the probe."""
+        with self._lock:
+            if self.state == 'closed':
+                return False
+            if self.state == 'open' and time.monotonic() - self._opened_at >= self.probe_interval_seconds:
+                logger.info(f"Auth circuit for account '{self.name}' half-open: sending a probe request to Amazon.")
+                self.state = 'half_open'
+                return True
+            self.fast_failures += 1
+        raise AuthenticationRequiredError("Amazon authentication required: cookies were rejected.")
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self.state != 'closed':
+                logger.info(f"Auth circuit for account '{self.name}' closed: Amazon accepted the cookies again.")
+            self.state = 'closed'
+
+    def record_auth_failure(self) -> None:
+        with self._lock:
+            if self.state == 'closed':
+                self.trips += 1
+                logger.warning(f"Auth circuit for account '{self.name}' opened: Amazon rejected the cookies. Failing fast until re-authentication.")
+            self.state = 'open'
+            self._opened_at = time.monotonic()
+
+    def release_probe(self) -> None:
+        """Releases a probe that ended without an auth verdict (other failure, cancellation) so another call can probe."""
+        with self._lock:
+            if self.state == 'half_open':
+                self.state = 'open'
+                self._opened_at = time.monotonic() - self.probe_interval_seconds
+
+    def reset(self) -> None:
+        with self._lock:
+            if self.state != 'closed':
+                logger.info(f"Auth circuit for account '{self.name}' reset: new cookies received.")
+            self.state = 'closed'
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "state": self.state,
+                "trips": self.trips,
+                "fast_failures": self.fast_failures,
+                "probe_interval_seconds": self.probe_interval_seconds
+            }
+
+def classify_request_error(err: requests.exceptions.RequestException) -> str:
+    """Maps a requests exception to a RetryPolicy error kind."""
+    if isinstance(err, requests.exceptions.ConnectTimeout):
+        return 'connect'
+    if isinstance(err, requests.exceptions.Timeout):
+        return 'timeout'
+    if isinstance(err, requests.exceptions.ConnectionError):
+        # Only a failure to open the connection proves Amazon never saw the request;
+        # a dropped one ("Connection aborted.") may already have been processed.
+        reason = err.args[0] if err.args else None
+        reason = getattr(reason, 'reason', reason)  # MaxRetryError wraps the cause
+        if isinstance(reason, (NewConnectionError, ConnectTimeoutError)):
+            return 'connect'
+    return 'transport'
+
 # --- API Request Function ---
+SUPPORTED_METHODS = ('GET', 'PUT', 'POST', 'DELETE')
+
 def make_authenticated_request(
     url: str,
-    # cookie_file_path: str, # No longer needed as parameter
     method: str = 'GET',
-    payload: Optional[Dict[str, Any]] = None
+    payload: Optional[Dict[str, Any]] = None,
+    account: Optional['Account'] = None
 ) -> Optional[requests.Response]:
-    """Makes an authenticated request using cookies from the fixed container path."""
-    try:
-        session = requests.Session()
-        session.headers.update(DEFAULT_HEADERS)
-        # Always load from the container path
-        cookie_list_of_dicts = load_cookies_from_json_file(CONTAINER_COOKIE_PATH)
+    """Makes a rate-limited, retried, authenticated request through the account's pooled client.
 
-        if not cookie_list_of_dicts:
-            logger.error(f"No cookies loaded from {CONTAINER_COOKIE_PATH} for authenticated request.")
-            return None
+    Returns None on failure. Raises AuthenticationRequiredError if there are no
+    cookies or Amazon rejects them (including while the auth circuit is open).
+    """
+    account = account or accounts.default
+    method = method.upper()
+    if method not in SUPPORTED_METHODS:
+        logger.error(f"Unsupported method specified: {method}")
+        return None
 
-        # Set cookies individually using requests' set method
-        for cookie_dict in cookie_list_of_dicts:
-            name = cookie_dict.get('name')
-            value = cookie_dict.get('value')
-            domain = cookie_dict.get('domain')
-            path = cookie_dict.get('path')
-
-            if name and value:
-                logger.debug(f"Setting cookie: name={name}, domain={domain}, path={path}")
-                session.cookies.set(
-                    name=name,
-                    value=value,
-                    domain=domain,
-                    path=path
-                    # requests automatically handles secure/expires/httpOnly for its context
-                    # We mainly need name, value, domain, path for session management
-                )
-            else:
-                logger.warning(f"Skipping cookie dict with missing name/value: {cookie_dict}")
+    cookies = account.cookie_store.get_jar()
+    if not cookies:
+        logger.error(f"No cookies loaded from {account.cookie_store.cookie_file_path} for authenticated request.")
+        raise AuthenticationRequiredError("Amazon authentication required: no cookies loaded.")
 
+    auth_breaker = account.auth_breaker
+    is_probe = auth_breaker.before_request()
+    try:
         logger.debug(f"Making {method} request to {url}")
-        if method.upper() == 'GET':
-            response = session.get(url)
-        elif method.upper() == 'PUT':
-            logger.debug(f"PUT payload: {payload}")
-            response = session.put(url, json=payload)
-        elif method.upper() == 'POST':
-            logger.debug(f"POST payload: {payload}")
-            response = session.post(url, json=payload)
-        elif method.upper() == 'DELETE':
-            logger.debug(f"DELETE request to {url}")
-            # Allow DELETE with an optional payload (needed for Alexa API)
-            response = session.delete(url, json=payload)
-        else:
-            logger.error(f"Unsupported method specified: {method}")
-            return None
+        if payload is not None:
+            logger.debug(f"{method} payload: {payload}")
 
-        response.raise_for_status() # Raise HTTPError for bad responses (4xx or 5xx)
-        logger.debug(f"Request successful ({response.status_code})")
-        return response
+        attempt = 0
+        while True:
+            wait = account.rate_limiter.reserve()
+            if wait > 0:
+                time.sleep(wait)
+            try:
+                # DELETE carries the item payload too (needed for Alexa API); GET sends none
+                response = get_alexa_client(account).request(method, url, payload=payload, cookies=cookies)
+            except requests.exceptions.RequestException as err:
+                delay = retry_policy.delay_for_error(method, classify_request_error(err), attempt)
+                if delay is None:
+                    raise
+                logger.warning(f"{method} {url} failed ({err}); retrying in {delay:.2f}s")
+            else:
+                if response.status_code < 400:
+                    logger.debug(f"Request successful ({response.status_code})")
+                    auth_breaker.record_success()
+                    account.cookie_store.merge_response_cookies(response.cookies)
+                    return response
+                if response.status_code in AUTH_FAILURE_STATUS_CODES:
+                    auth_breaker.record_auth_failure()
+                    raise AuthenticationRequiredError(
+                        f"Amazon authentication required: cookies rejected ({response.status_code})."
+                    )
+                delay = retry_policy.delay_for_status(
+                    method, response.status_code, response.headers.get('Retry-After'), attempt
+                )
+                if delay is None:
+                    raise requests.exceptions.HTTPError(
+                        f"{response.status_code} Error: {response.reason} for url: {url}", response=response
+                    )
+                logger.warning(f"{method} {url} returned {response.status_code}; retrying in {delay:.2f}s")
+            time.sleep(delay)
+            attempt += 1
 
+    except AuthenticationRequiredError:
+        raise
     except requests.exceptions.RequestException as err:
         logger.error(f"HTTP request failed: {err}")
         return None
     except Exception as e:
         logger.exception(f"Unexpected error during authenticated request: {e}")
         return None
+    finally:
+        if is_probe:
+            # A no-op once the probe settled the breaker; frees it after other failures or cancellation
+            auth_breaker.release_probe()
 
 # --- Shopping List Specific Functions ---
 def extract_list_items(response_data: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
@@ -152,142 +620,717 @@ def filter_incomplete_items(list_items: List[Dict[str, Any]]) -> List[Dict[str,
     """Filters a list of items to include only those not marked completed."""
     return [item for item in list_items if not item.get('completed', False)]
 
-def get_all_shopping_lists() -> Optional[List[Dict[str, Any]]]:
-    """Gets all available Alexa shopping lists by extracting unique list IDs from items."""
-    # Since the API doesn't have a direct getlists endpoint, we'll extract unique lists from items
-    logger.info("Getting all shopping lists by extracting from items...")
+# --- Item Name Index ---
+def normalize_item_name(name: str) -> str:
+    """Normalizes an item name for case-insensitive lookups."""
+    return name.strip().casefold()
 
-    # First get items from the default endpoint (no list_id parameter)
-    list_items_url = f"{api_config.AMAZON_URL}/alexashoppinglists/api/getlistitems"
-    response = make_authenticated_request(list_items_url, method='GET')
+def _stem_token(token: str) -> str:
+    """Crude plural stemming, applied identically to both sides of a comparison (berries/berry -> berri)."""
+    if len(token) <= 3 or token.isdigit():
+        return token
+    if token.endswith('ies'):
+        return token[:-3] + 'i'
+    if token.endswith('ie'):
+        return token[:-1]
+    if token.endswith('y'):
+        return token[:-1] + 'i'
+    if token.endswith(('sses', 'ches', 'shes', 'xes', 'zes', 'oes')):
+        return token[:-2]
+    if token.endswith('s') and not token.endswith('ss'):
+        return token[:-1]
+    return token
 
-    if not response:
-        logger.error("Failed to retrieve data to extract list information.")
-        return None
+def fold_item_name(name: str) -> str:
+    """Canonical form for loose matching: accents and case folded, punctuation dropped,
+    plurals stemmed and words sorted, so "2% Milk" and "milk 2%" fold alike."""
+    text = unicodedata.normalize('NFKD', name)
+    text = ''.join(ch for ch in text if not unicodedata.combining(ch)).casefold()
+    return ' '.join(sorted(_stem_token(token) for token in re.findall(r'[^\W_]+', text)))
 
-    try:
-        response_data = response.json()
-        # Try to extract list metadata first
-        list_metadata = extract_list_metadata(response_data)
-        items = extract_list_items(response_data)
+def _trigrams(folded: str) -> frozenset:
+    padded = f"  {folded} "
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
 
-        if items is None:
-            logger.error("Failed to extract items from response.")
-            return None
+class ItemIndex:
+    """Name -> items index over one list snapshot, partitioned by completion state.
 
-        # Extract unique lists from items
-        lists_dict = {}
+    Exact lookups use the case-folded name. match() falls back to the folded
+    name (fold_item_name) and then to trigram similarity, whose index is built
+    on first use. Items sharing a name keep their list order, so lookups return
+    the same item a linear scan would have found first.
+    """
+
+    def __init__(self, items: List[Dict[str, Any]]):
+        self.all: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        self.incomplete: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        self.completed: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        self.folded: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
         for item in items:
-            list_id = item.get('listId')
-            if list_id and list_id not in lists_dict:
-                # Create a list object with basic info
-                lists_dict[list_id] = {
-                    'listId': list_id,
-                    'name': None,  # Will try to get from metadata
-                    'customerId': item.get('customerId'),
-                    'itemCount': 0,
-                    'incompleteCount': 0,
-                    'completedCount': 0,
-                    'isPrimary': False
-                }
-
-                # If we have metadata for this list, add the name
-                if list_metadata and list_metadata.get('listId') == list_id:
-                    lists_dict[list_id]['name'] = list_metadata.get('name', 'Shopping List')
-                    lists_dict[list_id]['isPrimary'] = True
-
-            # Update counts
-            if list_id in lists_dict:
-                lists_dict[list_id]['itemCount'] += 1
-                if item.get('completed', False):
-                    lists_dict[list_id]['completedCount'] += 1
-                else:
-                    lists_dict[list_id]['incompleteCount'] += 1
-
-        # If we only have one list and no name was found, assume it's "Shopping List"
-        if len(lists_dict) == 1:
-            for list_data in lists_dict.values():
-                if list_data['name'] is None:
-                    list_data['name'] = 'Shopping List'
-                    list_data['isPrimary'] = True
-
-        result = list(lists_dict.values())
-        # Sort so primary list comes first
-        result.sort(key=lambda x: (not x.get('isPrimary', False), x.get('name', '')))
-        logger.info(f"Found {len(result)} unique shopping lists.")
-        return result
-
-    except requests.exceptions.JSONDecodeError as e:
-        logger.error(f"Failed to decode JSON response: {e}")
+            value = item.get('value') or ''
+            key = normalize_item_name(value)
+            self.all[key].append(item)
+            if item.get('completed', False):
+                self.completed[key].append(item)
+            else:
+                self.incomplete[key].append(item)
+            folded = fold_item_name(value)
+            if folded:  # Names without letters or digits (emoji, "!!!") only match exactly
+                self.folded[folded].append(item)
+        self._positions = {id(item): position for position, item in enumerate(items)}
+        self._trigram_index: Optional[Dict[str, List[str]]] = None
+        self._folded_trigrams: Dict[str, frozenset] = {}
+
+    def find_all(self, name: str, completed: Optional[bool] = None) -> List[Dict[str, Any]]:
+        """Returns every item matching the name in list order, optionally restricted to a completion state."""
+        if completed is None:
+            partition = self.all
+        else:
+            partition = self.completed if completed else self.incomplete
+        return partition.get(normalize_item_name(name), [])
+
+    def find(self, name: str, completed: Optional[bool] = None) -> Optional[Dict[str, Any]]:
+        """Returns the first item matching the name, optionally restricted to a completion state."""
+        matches = self.find_all(name, completed=completed)
+        return matches[0] if matches else None
+
+    def _build_trigram_index(self) -> Dict[str, List[str]]:
+        index: Dict[str, List[str]] = defaultdict(list)
+        for folded in self.folded:
+            trigrams = _trigrams(folded)
+            self._folded_trigrams[folded] = trigrams
+            for trigram in trigrams:
+                index[trigram].append(folded)
+        return index
+
+    def match(self, name: str, completed: Optional[bool] = None, threshold: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Returns items matching the name, best first, optionally restricted to a completion state.
+
+        Exact (case-insensitive) matches win outright. Otherwise items whose
+        folded names are equal score 1.0 and others score by trigram similarity
+        (Dice coefficient); those at or above the threshold (ITEM_MATCH_THRESHOLD
+        by default) are returned, ties in list order.
+        """
+        exact = self.find_all(name, completed=completed)
+        if exact:
+            return exact
+        if threshold is None:
+            threshold = api_config.ITEM_MATCH_THRESHOLD
+
+        folded = fold_item_name(name)
+        scores: Dict[str, float] = {}
+        if folded and folded in self.folded:
+            scores[folded] = 1.0
+        if threshold < 1.0 and folded:
+            if self._trigram_index is None:
+                self._trigram_index = self._build_trigram_index()
+            query = _trigrams(folded)
+            shared: Dict[str, int] = defaultdict(int)
+            for trigram in query:
+                for candidate in self._trigram_index.get(trigram, ()):
+                    shared[candidate] += 1
+            for candidate, count in shared.items():
+                score = 2 * count / (len(query) + len(self._folded_trigrams[candidate]))
+                if score >= threshold:
+                    scores[candidate] = max(score, scores.get(candidate, 0.0))
+
+        ranked = [
+            (score, self._positions[id(item)], item)
+            for candidate, score in scores.items()
+            for item in self.folded[candidate]
+            if completed is None or item.get('completed', False) == completed
+        ]
+        ranked.sort(key=lambda entry: (-entry[0], entry[1]))
+        return [item for _, _, item in ranked]
+
+# --- Item Views ---
+# Sort keys accepted by ListSnapshot.view(); prefix with '-' for descending order
+ITEM_SORT_KEYS = {
+    'name': lambda item: normalize_item_name(item.get('value') or ''),
+    'created': lambda item: item.get('createdDateTime') or 0,
+    'updated': lambda item: item.get('updatedDateTime') or 0,
+}
+
+def parse_item_fields(fields: Optional[str]) -> Optional[tuple]:
+    """Parses a comma-separated field list into a canonical (sorted, de-duplicated) tuple."""
+    if not fields:
         return None
+    names = {name.strip() for name in fields.split(',') if name.strip()}
+    return tuple(sorted(names)) or None
 
-def get_shopping_list_items(list_id: Optional[str] = None) -> Optional[List[Dict[str, Any]]]:
-    """Gets all items from the Alexa shopping list. If list_id is provided, gets items from that specific list."""
-    if list_id:
-        list_items_url = f"{api_config.AMAZON_URL}/alexashoppinglists/api/getlistitems?listId={list_id}"
-    else:
-        list_items_url = f"{api_config.AMAZON_URL}/alexashoppinglists/api/getlistitems"
+def project_item(item: Dict[str, Any], fields: tuple) -> Dict[str, Any]:
+    """Returns only the requested fields of an item (fields it lacks are omitted)."""
+    return {name: item[name] for name in fields if name in item}
+
+# --- List Snapshots ---
+class ListSnapshot:
+    """One fetched getlistitems response plus views derived from it on first use.
+
+    Snapshots are never modified once built, so derived data (the item name
+    index, the ETag) can be memoized on them; mutations produce new snapshots.
+    fetched_at is the wall-clock time the data was received from Amazon.
+    """
+
+    def __init__(self, response_data: Dict[str, Any], fetched_at: Optional[float] = None, etag: Optional[str] = None):
+        self.response_data = response_data
+        self.items: Optional[List[Dict[str, Any]]] = extract_list_items(response_data)
+        self.fetched_at = fetched_at if fetched_at is not None else time.time()
+        self._index: Optional[ItemIndex] = None
+        self._etag: Optional[str] = etag
+        self._views: Dict[tuple, List[Dict[str, Any]]] = {}
+
+    @property
+    def index(self) -> ItemIndex:
+        """Name index over the snapshot's items."""
+        if self._index is None:
+            self._index = ItemIndex(self.items or [])
+        return self._index
+
+    @property
+    def etag(self) -> str:
+        """Stable content hash of the snapshot, usable as an HTTP entity tag."""
+        if self._etag is None:
+            canonical = json.dumps(self.response_data, sort_keys=True, separators=(',', ':'), default=str)
+            self._etag = hashlib.sha1(canonical.encode('utf-8')).hexdigest()
+        return self._etag
+
+    def view(self, completed: Optional[bool] = None, sort: Optional[str] = None, fields: Optional[tuple] = None) -> List[Dict[str, Any]]:
+        """Returns the items filtered by completion state, sorted and projected, memoized per shape.
+
+        Sort is one of ITEM_SORT_KEYS, optionally prefixed with '-'; fields is a
+        tuple from parse_item_fields(). Callers page by slicing the result.
+        """
+        key = (completed, sort, fields)
+        view = self._views.get(key)
+        if view is not None:
+            return view
+
+        items = self.items or []
+        if completed is not None:
+            items = [item for item in items if bool(item.get('completed', False)) == completed]
+        if sort:
+            items = sorted(items, key=ITEM_SORT_KEYS[sort.lstrip('-')], reverse=sort.startswith('-'))
+        if fields:
+            items = [project_item(item, fields) for item in items]
+
+        if len(self._views) >= api_config.LIST_VIEW_CACHE_SIZE:
+            self._views.clear()  # Clients use a handful of shapes; don't let odd ones pile up
+        self._views[key] = items
+        return items
+
+    def without_item(self, item_id: str) -> 'ListSnapshot':
+        """Returns a new snapshot with the given item removed."""
+        response_data = {}
+        for key, value in self.response_data.items():
+            if isinstance(value, dict) and 'listItems' in value:
+                value = dict(value, listItems=[i for i in value['listItems'] if i.get('id') != item_id])
+            response_data[key] = value
+        return ListSnapshot(response_data, fetched_at=self.fetched_at)
 
-    response = make_authenticated_request(list_items_url, method='GET')
-    if response:
+# --- Shopping List Cache ---
+class _CacheEntry:
+    __slots__ = ('expires_at', 'snapshot')
+
+    def __init__(self, expires_at: float, snapshot: ListSnapshot):
+        self.expires_at = expires_at
+        self.snapshot = snapshot
+
+class ShoppingListCache:
+    """Read-through cache of list snapshots, keyed by list ID (None for the default list).
+
+    Entries expire after a TTL. Mutations either patch the cached snapshot
+    (deletes) or invalidate the affected lists (adds and updates, whose new
+    item versions are only known to Amazon).
+
+    Every mutation also bumps a generation counter. Fetches record the
+    generation when they start, and ``put`` discards a snapshot whose list
+    changed in the meantime, so a slow fetch cannot resurrect a deleted item.
+    """
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.discarded = 0
+        self._entries: Dict[Optional[str], _CacheEntry] = {}
+        # Per-list generations, plus one for changes that may touch any list
+        self._generations: Dict[Optional[str], int] = defaultdict(int)
+        self._epoch = 0
+        self._lock = threading.Lock()
+
+    def generation(self, list_id: Optional[str] = None) -> tuple:
+        """Returns a token that changes whenever the list is invalidated or patched; pass it to ``put``."""
+        with self._lock:
+            return (self._epoch, self._generations[list_id])
+
+    def get(self, list_id: Optional[str] = None) -> Optional[ListSnapshot]:
+        """Returns the cached snapshot for a list, or None if absent or expired."""
+        with self._lock:
+            entry = self._entries.get(list_id)
+            if entry is not None and entry.expires_at > time.monotonic():
+                self.hits += 1
+                return entry.snapshot
+            self.misses += 1
+            return None
+
+    def put(self, list_id: Optional[str], snapshot: ListSnapshot, generation: Optional[tuple] = None) -> bool:
+        """Stores a freshly fetched snapshot for a list.
+
+        Returns False (and stores nothing) if the list changed since ``generation``
+        was taken, i.e. the snapshot predates a mutation.
+        """
+        with self._lock:
+            if generation is not None and generation != (self._epoch, self._generations[list_id]):
+                self.discarded += 1
+                logger.debug(f"Discarding snapshot of list {list_id} fetched before a mutation.")
+                return False
+            if self.ttl_seconds > 0:
+                self._entries[list_id] = _CacheEntry(time.monotonic() + self.ttl_seconds, snapshot)
+            return True
+
+    def invalidate(self, list_id: Optional[str] = None) -> None:
+        """Drops a list and the default-list entry (which may alias it). With no list ID, drops everything."""
+        with self._lock:
+            if list_id is None:
+                self._epoch += 1
+                self._entries.clear()
+            else:
+                self._generations[list_id] += 1
+                self._generations[None] += 1
+                self._entries.pop(list_id, None)
+                self._entries.pop(None, None)
+
+    def remove_item(self, item_id: str) -> None:
+        """Removes a deleted item from every cached list that contains it."""
+        with self._lock:
+            # Any list may hold the item, including ones being fetched but not cached yet
+            self._epoch += 1
+            for entry in self._entries.values():
+                if any(i.get('id') == item_id for i in entry.snapshot.items or []):
+                    entry.snapshot = entry.snapshot.without_item(item_id)
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns hit/miss counters and the number of cached lists."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / total, 3) if total else 0.0,
+                "discarded": self.discarded,
+                "entries": len(self._entries),
+                "ttl_seconds": self.ttl_seconds
+            }
+
+# --- Accounts ---
+class UnknownAccountError(LookupError):
+    """Raised when a request names an account that is invalid or has never been set up."""
+
+# Account IDs become directory names, so keep them to a safe character set
+ACCOUNT_ID_PATTERN = re.compile(r'[A-Za-z0-9][A-Za-z0-9_.-]{0,63}')
+
+class Account:
+    """State kept per Amazon account: cookies, locale, list cache, rate limit, auth breaker and primary list ID."""
+
+    def __init__(self, account_id: str, cookie_file_path: str, amazon_url: str):
+        self.account_id = account_id
+        self.amazon_url = amazon_url.rstrip('/')
+        self.cookie_store = CookieStore(cookie_file_path, api_config.COOKIE_PERSIST_DELAY_SECONDS)
+        self.list_cache = ShoppingListCache(api_config.LIST_CACHE_TTL_SECONDS)
+        self.rate_limiter = TokenBucket(api_config.UPSTREAM_RATE_LIMIT_PER_SECOND, api_config.UPSTREAM_RATE_LIMIT_BURST)
+        self.auth_breaker = AuthCircuitBreaker(api_config.AUTH_BREAKER_PROBE_INTERVAL_SECONDS, name=account_id)
+        # Resolved once from list metadata and reused for adds; refreshed only when an add fails
+        self.primary_list_id: Optional[str] = None
+        # Snapshots restored from the list mirror, until the mirror is written again
+        self.mirrored_snapshots: Dict[Optional[str], ListSnapshot] = {}
+
+    def remember_primary_list_id(self, list_id: Optional[str]) -> None:
+        """Stores (or clears, with None) the primary list ID."""
+        if list_id != self.primary_list_id:
+            logger.debug(f"Primary list ID for account '{self.account_id}' set to: {list_id}")
+        self.primary_list_id = list_id
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "amazon_url": self.amazon_url,
+            "list_cache": self.list_cache.stats(),
+            "rate_limiter": self.rate_limiter.stats(),
+            "auth_breaker": self.auth_breaker.stats(),
+            "cookies": self.cookie_store.stats()
+        }
+
+class AccountRegistry:
+    """The accounts served by this process, created on first use.
+
+    The default account reads COOKIE_PATH; every other account reads
+    ``<accounts_dir>/<account_id>/cookies.json``. Only accounts whose cookie file
+    exists are looked up, so arbitrary IDs in requests cannot grow the registry.
+    """
+
+    def __init__(self, default_account_id: str, default_cookie_path: str, accounts_dir: str, amazon_url: str, amazon_urls: Dict[str, str]):
+        self.default_account_id = default_account_id
+        self.default_cookie_path = default_cookie_path
+        self.accounts_dir = accounts_dir
+        self.amazon_url = amazon_url
+        self.amazon_urls = amazon_urls
+        self._accounts: Dict[str, Account] = {}
+        self._lock = threading.Lock()
+        self.default = self.get(default_account_id)
+
+    def cookie_path(self, account_id: str) -> str:
+        if account_id == self.default_account_id:
+            return self.default_cookie_path
+        return os.path.join(self.accounts_dir, account_id, "cookies.json")
+
+    def get(self, account_id: Optional[str] = None, create: bool = False) -> Account:
+        """Returns an account by ID (the default account for None).
+
+        Raises UnknownAccountError for malformed IDs, and for accounts without a
+        cookie file unless create is set.
+        """
+        account_id = account_id or self.default_account_id
+        account = self._accounts.get(account_id)
+        if account is not None:
+            return account
+        if not ACCOUNT_ID_PATTERN.fullmatch(account_id):
+            raise UnknownAccountError(f"Invalid account ID '{account_id}'.")
+        cookie_path = self.cookie_path(account_id)
+        if not create and account_id != self.default_account_id and not os.path.exists(cookie_path):
+            raise UnknownAccountError(f"Unknown account '{account_id}'.")
+        with self._lock:
+            account = self._accounts.get(account_id)
+            if account is None:
+                amazon_url = self.amazon_urls.get(account_id, self.amazon_url)
+                account = Account(account_id, cookie_path, amazon_url)
+                self._accounts[account_id] = account
+                logger.info(f"Serving account '{account_id}' ({amazon_url}, cookies at {cookie_path}).")
+        return account
+
+    def all(self) -> List[Account]:
+        """Returns every account in use or with a cookie file on disk."""
         try:
-            response_data = response.json()
-            logger.debug("Successfully retrieved shopping list data.")
-            return extract_list_items(response_data)
-        except requests.exceptions.JSONDecodeError as e:
-            logger.error(f"Failed to decode JSON response from shopping list API: {e}")
-            logger.debug(f"Response text: {response.text[:500]}") # Log first 500 chars
+            account_ids = sorted(os.listdir(self.accounts_dir))
+        except OSError:
+            account_ids = []
+        for account_id in account_ids:
+            if account_id not in self._accounts and ACCOUNT_ID_PATTERN.fullmatch(account_id):
+                try:
+                    self.get(account_id)
+                except UnknownAccountError:
+                    continue  # Directory without a cookie file
+        return list(self._accounts.values())
+
+accounts = AccountRegistry(
+    api_config.DEFAULT_ACCOUNT_ID,
+    api_config.COOKIE_PATH,
+    api_config.ACCOUNTS_DIR,
+    api_config.AMAZON_URL,
+    api_config.ACCOUNT_AMAZON_URLS
+)
+
+# --- List Mirror ---
+# Optional SQLite copy of every fetched list, used to answer reads while Amazon
+# can't be reached (e.g. expired cookies). Failures to write it never fail a request.
+list_mirror: Optional[ListMirror] = ListMirror(api_config.LIST_MIRROR_PATH) if api_config.LIST_MIRROR_ENABLED else None
+
+def _write_mirror(account: Account, operation: str, *args: Any) -> None:
+    if list_mirror is None:
+        return
+    account.mirrored_snapshots.clear()
+    try:
+        getattr(list_mirror, operation)(account.account_id, *args)
+    except Exception as e:
+        logger.error(f"List mirror {operation} failed for account '{account.account_id}': {e}", exc_info=True)
+
+def load_mirrored_snapshot(account: Account, list_id: Optional[str] = None) -> Optional[ListSnapshot]:
+    """Returns the mirrored copy of a list, or None if there is no mirror or it never stored this list."""
+    if list_mirror is None:
+        return None
+    snapshot = account.mirrored_snapshots.get(list_id)
+    if snapshot is None:
+        try:
+            mirrored = list_mirror.load(account.account_id, list_id)
+        except Exception as e:
+            logger.error(f"List mirror load failed for account '{account.account_id}': {e}", exc_info=True)
             return None
-    else:
-        logger.error("Failed to retrieve shopping list data.")
+        if mirrored is None:
+            return None
+        response_data, etag, fetched_at = mirrored
+        snapshot = ListSnapshot(response_data, fetched_at=fetched_at, etag=etag)
+        account.mirrored_snapshots[list_id] = snapshot
+    return snapshot
+
+def record_list_fetched(account: Account, list_id: Optional[str], snapshot: ListSnapshot, generation: Optional[tuple] = None) -> None:
+    """Caches (and mirrors) a list snapshot just fetched from Amazon, unless a mutation made it stale."""
+    if not account.list_cache.put(list_id, snapshot, generation):
+        return
+    if list_mirror is not None:
+        _write_mirror(account, 'store', list_id, snapshot.response_data, snapshot.etag, snapshot.fetched_at)
+
+def record_item_added(account: Account, list_id: str, added_item: Optional[Dict[str, Any]] = None) -> None:
+    """Updates the cache after an item was added to a list (and the mirror, if Amazon returned the new item)."""
+    account.list_cache.invalidate(list_id)
+    if isinstance(added_item, dict) and added_item.get('id'):
+        added_item = dict(added_item, listId=added_item.get('listId') or list_id)
+        _write_mirror(account, 'add_item', added_item, list_id == account.primary_list_id)
+
+def record_item_deleted(account: Account, list_item: Dict[str, Any]) -> None:
+    """Updates the cache and mirror after an item was deleted."""
+    item_id = list_item.get('id')
+    if not item_id:
+        # Can't patch by ID; fall back to refetching the list
+        account.list_cache.invalidate(list_item.get('listId'))
+        return
+    account.list_cache.remove_item(item_id)
+    _write_mirror(account, 'remove_item', item_id)
+
+def record_item_updated(account: Account, list_item: Dict[str, Any], completed_status: bool) -> None:
+    """Updates the cache and mirror after an item's completed status changed."""
+    account.list_cache.invalidate(list_item.get('listId'))
+    _write_mirror(account, 'update_item', list_item.get('id'), completed_status)
+
+# --- Primary List ID ---
+
+def primary_list_id_from_response(response_data: Dict[str, Any]) -> Optional[str]:
+    """Determines the primary list ID from a default getlistitems response, even if the list is empty."""
+    metadata = extract_list_metadata(response_data)
+    if metadata and metadata.get('listId'):
+        return metadata['listId']
+    lists = build_lists_from_response(response_data)
+    if lists:
+        return lists[0]['listId']
+    return None
+
+# --- Request/Response Helpers ---
+# Shared by the sync functions below and their async counterparts in alexa_api_async.
+
+def list_items_url(account: Account, list_id: Optional[str] = None) -> str:
+    """Builds the getlistitems URL, optionally scoped to a specific list."""
+    url = f"{account.amazon_url}/alexashoppinglists/api/getlistitems"
+    if list_id:
+        url = f"{url}?listId={list_id}"
+    return url
+
+def decode_list_items_response(response: Any) -> Optional[Dict[str, Any]]:
+    """Decodes a getlistitems response body."""
+    try:
+        response_data = response.json()
+    except ValueError as e:
+        logger.error(f"Failed to decode JSON response from shopping list API: {e}")
+        logger.debug(f"Response text: {response.text[:500]}") # Log first 500 chars
         return None
+    logger.debug("Successfully retrieved shopping list data.")
+    return response_data
 
-def add_shopping_list_item(item_value: str) -> bool:
-    """Adds a new item to the Alexa shopping list."""
-    logger.info(f"Adding item to shopping list: {item_value}")
+def added_item_from_response(response: Any) -> Optional[Dict[str, Any]]:
+    """Returns the item Amazon echoes back from addlistitem, if the body is one."""
+    try:
+        body = response.json()
+    except ValueError:
+        return None
+    return body if isinstance(body, dict) else None
 
-    # Get the list ID dynamically from existing items
-    items = get_shopping_list_items()
-    if not items or len(items) == 0:
-        logger.error("Cannot add item: No existing items found to determine list ID")
-        return False
+def items_from_snapshot(snapshot: Optional[ListSnapshot]) -> Optional[List[Dict[str, Any]]]:
+    """Returns a copy of a (possibly cached) snapshot's item list."""
+    if snapshot is None or snapshot.items is None:
+        return None
+    return list(snapshot.items)
 
-    list_id = items[0].get('listId')
-    if not list_id:
-        logger.error("Cannot add item: Could not extract list ID from existing items")
-        return False
+def build_lists_from_response(response_data: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
+    """Builds list summaries by extracting unique list IDs from a getlistitems response."""
+    # Try to extract list metadata first
+    list_metadata = extract_list_metadata(response_data)
+    items = extract_list_items(response_data)
+
+    if items is None:
+        logger.error("Failed to extract items from response.")
+        return None
+
+    # Extract unique lists from items
+    lists_dict = {}
+    for item in items:
+        list_id = item.get('listId')
+        if list_id and list_id not in lists_dict:
+            # Create a list object with basic info
+            lists_dict[list_id] = {
+                'listId': list_id,
+                'name': None,  # Will try to get from metadata
+                'customerId': item.get('customerId'),
+                'itemCount': 0,
+                'incompleteCount': 0,
+                'completedCount': 0,
+                'isPrimary': False
+            }
+
+            # If we have metadata for this list, add the name
+            if list_metadata and list_metadata.get('listId') == list_id:
+                lists_dict[list_id]['name'] = list_metadata.get('name', 'Shopping List')
+                lists_dict[list_id]['isPrimary'] = True
 
-    logger.debug(f"Using list ID: {list_id}")
+        # Update counts
+        if list_id in lists_dict:
+            lists_dict[list_id]['itemCount'] += 1
+            if item.get('completed', False):
+                lists_dict[list_id]['completedCount'] += 1
+            else:
+                lists_dict[list_id]['incompleteCount'] += 1
+
+    # If we only have one list and no name was found, assume it's "Shopping List"
+    if len(lists_dict) == 1:
+        for list_data in lists_dict.values():
+            if list_data['name'] is None:
+                list_data['name'] = 'Shopping List'
+                list_data['isPrimary'] = True
+
+    result = list(lists_dict.values())
+    # Sort so primary list comes first
+    result.sort(key=lambda x: (not x.get('isPrimary', False), x.get('name') or ''))
+    logger.info(f"Found {len(result)} unique shopping lists.")
+    return result
+
+def embed_list_items(list_summary: Dict[str, Any], snapshot: Optional[ListSnapshot], fields: Optional[tuple] = None) -> Dict[str, Any]:
+    """Returns a copy of a list summary with the items and counts taken from that list's own snapshot."""
+    entry = dict(list_summary)
+    if snapshot is None or snapshot.items is None:
+        entry['items'] = None
+        entry['error'] = "Could not retrieve items for this list."
+        return entry
+    completed_count = sum(1 for item in snapshot.items if item.get('completed', False))
+    entry['itemCount'] = len(snapshot.items)
+    entry['completedCount'] = completed_count
+    entry['incompleteCount'] = len(snapshot.items) - completed_count
+    entry['items'] = snapshot.view(fields=fields)
+    return entry
+
+def add_item_request(account: Account, list_id: str, item_value: str) -> tuple:
+    """Returns the (url, payload) for adding an item to a list."""
     add_item_path = f"/alexashoppinglists/api/addlistitem/{list_id}"
-    url = f"{api_config.AMAZON_URL}{add_item_path}"
     payload = {
         "value": item_value,
         "type": "TASK" # Assuming 'TASK' type, common for shopping/todo lists
     }
+    return f"{account.amazon_url}{add_item_path}", payload
+
+def delete_item_url(account: Account) -> str:
+    """Returns the URL for deleting an item (the item dict is sent as payload)."""
+    # Use the correct base endpoint from documentation
+    return f"{account.amazon_url}/alexashoppinglists/api/deletelistitem"
+
+def update_item_request(account: Account, list_item: Dict[str, Any], completed_status: bool) -> tuple:
+    """Returns the (url, payload) for updating an item's completed status."""
+    list_item_copy = list_item.copy()
+    list_item_copy['completed'] = completed_status
+    return f"{account.amazon_url}/alexashoppinglists/api/updatelistitem", list_item_copy
+
+def check_mutation_response(response: Any, success_codes: tuple, failure_message: str) -> bool:
+    """Checks a mutation response status, logging the failure details if any."""
+    if response is not None and response.status_code in success_codes:
+        return True
+    status = response.status_code if response is not None else 'No Response'
+    logger.error(f"{failure_message} (Status: {status})")
+    # Log response text for debugging if available and failed
+    if response is not None:
+        logger.debug(f"Response text: {response.text[:500]}")
+    return False
+
+# --- Shopping List Functions ---
+
+def fetch_list_snapshot(list_id: Optional[str] = None, use_cache: bool = True, account: Optional[Account] = None) -> Optional[ListSnapshot]:
+    """Returns the current snapshot of a list, from the account's cache when fresh."""
+    account = account or accounts.default
+    if use_cache:
+        cached = account.list_cache.get(list_id)
+        if cached is not None:
+            return cached
+
+    generation = account.list_cache.generation(list_id)
+    response = make_authenticated_request(list_items_url(account, list_id), method='GET', account=account)
+    if not response:
+        logger.error("Failed to retrieve shopping list data.")
+        return None
+
+    response_data = decode_list_items_response(response)
+    if response_data is None:
+        return None
+    snapshot = ListSnapshot(response_data)
+    record_list_fetched(account, list_id, snapshot, generation)
+    return snapshot
 
-    response = make_authenticated_request(
-        url,
-        method='POST',
-        payload=payload
-    )
+def get_all_shopping_lists(account: Optional[Account] = None) -> Optional[List[Dict[str, Any]]]:
+    """Gets all available Alexa shopping lists by extracting unique list IDs from items."""
+    # Since the API doesn't have a direct getlists endpoint, we'll extract unique lists from items
+    logger.info("Getting all shopping lists by extracting from items...")
+
+    # First get items from the default endpoint (no list_id parameter)
+    snapshot = fetch_list_snapshot(account=account)
+    if snapshot is None:
+        logger.error("Failed to retrieve data to extract list information.")
+        return None
+    return build_lists_from_response(snapshot.response_data)
+
+def get_shopping_list_items(list_id: Optional[str] = None, use_cache: bool = True, account: Optional[Account] = None) -> Optional[List[Dict[str, Any]]]:
+    """Gets all items from the Alexa shopping list. If list_id is provided, gets items from that specific list."""
+    return items_from_snapshot(fetch_list_snapshot(list_id, use_cache=use_cache, account=account))
+
+def get_item_index(list_id: Optional[str] = None, account: Optional[Account] = None) -> Optional[ItemIndex]:
+    """Gets the name index for a list's current snapshot, for O(1) lookups by item name."""
+    snapshot = fetch_list_snapshot(list_id, account=account)
+    if snapshot is None:
+        return None
+    return snapshot.index
+
+def resolve_primary_list_id(refresh: bool = False, account: Optional[Account] = None) -> Optional[str]:
+    """Returns the primary list ID, resolving it from list metadata on first use or when refresh is set."""
+    account = account or accounts.default
+    if not refresh and account.primary_list_id:
+        return account.primary_list_id
+
+    snapshot = fetch_list_snapshot(use_cache=not refresh, account=account)
+    if snapshot is None:
+        logger.error("Cannot resolve primary list ID: failed to retrieve list data")
+        return None
+    list_id = primary_list_id_from_response(snapshot.response_data)
+    account.remember_primary_list_id(list_id)
+    return list_id
 
-    if response and response.status_code == 200: # Assuming 200 OK for success
+def add_shopping_list_item_to_list(list_id: str, item_value: str, account: Optional[Account] = None) -> bool:
+    """Adds a new item to a specific Alexa list."""
+    account = account or accounts.default
+    logger.info(f"Adding item to list {list_id}: {item_value}")
+    url, payload = add_item_request(account, list_id, item_value)
+    response = make_authenticated_request(url, method='POST', payload=payload, account=account)
+
+    # Assuming 200 OK for success
+    if check_mutation_response(response, (200,), f"Failed to add item: {item_value}"):
         logger.info(f"Successfully added item: {item_value}")
+        record_item_added(account, list_id, added_item_from_response(response))
         return True
-    else:
-        status = response.status_code if response else 'No Response'
-        logger.error(f"Failed to add item: {item_value} (Status: {status})")
-        # Log response text for debugging if available and failed
-        if response is not None:
-             logger.debug(f"Add item response text: {response.text[:500]}")
+    return False
+
+def add_shopping_list_item(item_value: str, account: Optional[Account] = None) -> bool:
+    """Adds a new item to the primary Alexa shopping list."""
+    list_id = resolve_primary_list_id(account=account)
+    if not list_id:
+        logger.error("Cannot add item: Could not determine the shopping list ID")
         return False
 
-def mark_item_as_completed(list_item: Dict[str, Any]) -> bool:
+    if add_shopping_list_item_to_list(list_id, item_value, account=account):
+        return True
+
+    # The cached ID may be stale; re-resolve once and retry if it changed
+    fresh_list_id = resolve_primary_list_id(refresh=True, account=account)
+    if fresh_list_id and fresh_list_id != list_id:
+        logger.info(f"Primary list ID changed ({list_id} -> {fresh_list_id}); retrying add.")
+        return add_shopping_list_item_to_list(fresh_list_id, item_value, account=account)
+    return False
+
+def mark_item_as_completed(list_item: Dict[str, Any], account: Optional[Account] = None) -> bool:
     """Marks a specific shopping list item as completed via the API."""
-    return _update_item_completion_status(list_item, completed_status=True)
+    return _update_item_completion_status(list_item, completed_status=True, account=account)
 
-def delete_shopping_list_item(list_item: Dict[str, Any]) -> bool:
+def delete_shopping_list_item(list_item: Dict[str, Any], account: Optional[Account] = None) -> bool:
     """Deletes a specific shopping list item via the API."""
+    account = account or accounts.default
     item_value = list_item.get('value', 'unknown')
     item_id = list_item.get('id')
 
@@ -296,58 +1339,33 @@ def delete_shopping_list_item(list_item: Dict[str, Any]) -> bool:
         return False
 
     logger.info(f"Deleting item: {item_value} (ID: {item_id})")
-    # Use the correct base endpoint from documentation
-    delete_item_path = "/alexashoppinglists/api/deletelistitem"
-    url = f"{api_config.AMAZON_URL}{delete_item_path}"
-
-    # Send the item dict (containing ID) as payload
-    response = make_authenticated_request(
-        url,
-        # config.cookie_path, # Removed
-        method='DELETE',
-        payload=list_item # Send the whole item dict
-    )
+    # Send the whole item dict (containing ID) as payload
+    response = make_authenticated_request(delete_item_url(account), method='DELETE', payload=list_item, account=account)
 
     # Check for successful deletion (often 200 OK or 204 No Content)
-    if response and (response.status_code == 200 or response.status_code == 204):
+    if check_mutation_response(response, (200, 204), f"Failed to delete item: {item_value}"):
         logger.info(f"Successfully deleted item: {item_value}")
+        record_item_deleted(account, list_item)
         return True
-    else:
-        status = response.status_code if response else 'No Response'
-        logger.error(f"Failed to delete item: {item_value} (Status: {status})")
-        # Log response text for debugging if available and failed
-        if response is not None:
-            logger.debug(f"Delete item response text: {response.text[:500]}")
-        return False
+    return False
 
-def unmark_item_as_completed(list_item: Dict[str, Any]) -> bool:
+def unmark_item_as_completed(list_item: Dict[str, Any], account: Optional[Account] = None) -> bool:
     """Unmarks a specific shopping list item as completed via the API."""
-    return _update_item_completion_status(list_item, completed_status=False)
+    return _update_item_completion_status(list_item, completed_status=False, account=account)
 
-def _update_item_completion_status(list_item: Dict[str, Any], completed_status: bool) -> bool:
+def _update_item_completion_status(list_item: Dict[str, Any], completed_status: bool, account: Optional[Account] = None) -> bool:
     """Internal helper to update the completed status of an item."""
+    account = account or accounts.default
     item_value = list_item.get('value', 'unknown')
     action = "Marking" if completed_status else "Unmarking"
     action_past = "marked" if completed_status else "unmarked"
 
     logger.info(f"{action} item as completed: {item_value}")
-    url = f"{api_config.AMAZON_URL}/alexashoppinglists/api/updatelistitem"
-    list_item_copy = list_item.copy()
-    list_item_copy['completed'] = completed_status
-
-    response = make_authenticated_request(
-        url,
-        # config.cookie_path, # Removed
-        method='PUT',
-        payload=list_item_copy
-    )
+    url, payload = update_item_request(account, list_item, completed_status)
+    response = make_authenticated_request(url, method='PUT', payload=payload, account=account)
 
-    if response and response.status_code == 200:
+    if check_mutation_response(response, (200,), f"Failed to {action.lower()} item as completed: {item_value}"):
         logger.info(f"Successfully {action_past} item as completed: {item_value}")
+        record_item_updated(account, list_item, completed_status)
         return True
-    else:
-        status = response.status_code if response else 'No Response'
-        logger.error(f"Failed to {action.lower()} item as completed: {item_value} (Status: {status})")
-        if response is not None:
-            logger.debug(f"{action} item response text: {response.text[:500]}")
-        return False
+    return False
@@ -0,0 +1,371 @@
+"""Asyncio-native counterparts of the Alexa API functions (shopping list).
+
+The FastAPI server uses these so that waiting on Amazon never blocks the event
+loop. Request building, response parsing and cookie handling are shared with
+the synchronous functions in ``alexa_api``, which remain available for scripts.
+"""
+
+import asyncio
+import logging
+from typing import Optional, List, Dict, Any, Callable, Awaitable, Hashable
+
+import httpx
+
+from . import config as api_config
+from .alexa_api import (
+    DEFAULT_HEADERS,
+    ItemIndex,
+    Account,
+    accounts,
+    record_item_added,
+    record_item_deleted,
+    record_item_updated,
+    record_list_fetched,
+    added_item_from_response,
+    primary_list_id_from_response,
+    list_items_url,
+    decode_list_items_response,
+    ListSnapshot,
+    items_from_snapshot,
+    build_lists_from_response,
+    add_item_request,
+    delete_item_url,
+    update_item_request,
+    check_mutation_response,
+    retry_policy,
+    AuthenticationRequiredError,
+    AUTH_FAILURE_STATUS_CODES,
+    SUPPORTED_METHODS,
+)
+
+logger = logging.getLogger(__name__)
+
+# --- HTTP Client ---
+class AsyncAlexaClient:
+    """Long-lived async HTTP client for Amazon requests with a shared connection pool."""
+
+    def __init__(
+        self,
+        pool_maxsize: int,
+        connect_timeout: float,
+        read_timeout: float
+    ):
+        self.client = httpx.AsyncClient(
+            headers=DEFAULT_HEADERS,
+            limits=httpx.Limits(
+                max_connections=pool_maxsize,
+                max_keepalive_connections=pool_maxsize
+            ),
+            timeout=httpx.Timeout(read_timeout, connect=connect_timeout)
+        )
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        payload: Optional[Dict[str, Any]] = None,
+        cookies: Any = None
+    ) -> httpx.Response:
+        """Sends a request over the pooled client using the configured timeouts."""
+        # build_request + send lets us attach the cookie jar per request without
+        # persisting it on the client instance
+        request = self.client.build_request(method, url, json=payload, cookies=cookies)
+        return await self.client.send(request)
+
+    async def close(self) -> None:
+        """Closes all pooled connections."""
+        await self.client.aclose()
+
+# One client per account, as httpx keeps cookies Amazon sets in responses
+_clients: Dict[str, AsyncAlexaClient] = {}
+
+def get_async_alexa_client(account: Account) -> AsyncAlexaClient:
+    """Returns the account's async Alexa client, creating it on first use."""
+    client = _clients.get(account.account_id)
+    if client is None:
+        client = AsyncAlexaClient(
+            pool_maxsize=api_config.HTTP_POOL_MAXSIZE,
+            connect_timeout=api_config.HTTP_CONNECT_TIMEOUT,
+            read_timeout=api_config.HTTP_READ_TIMEOUT
+        )
+        _clients[account.account_id] = client
+        logger.debug(f"Created pooled async Alexa HTTP client for account '{account.account_id}'.")
+    return client
+
+async def close_async_alexa_clients() -> None:
+    """Closes every async Alexa client created so far."""
+    clients = list(_clients.values())
+    _clients.clear()
+    for client in clients:
+        await client.close()
+
+# --- API Request Function ---
+def classify_request_error(err: httpx.TransportError) -> str:
+    """Maps an httpx transport exception to a RetryPolicy error kind."""
+    if isinstance(err, (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)):
+        return 'connect'
+    if isinstance(err, httpx.TimeoutException):
+        return 'timeout'
+    return 'transport'
+
+async def make_authenticated_request(
+    url: str,
+    method: str = 'GET',
+    payload: Optional[Dict[str, Any]] = None,
+    account: Optional[Account] = None
+) -> Optional[httpx.Response]:
+    """Makes a rate-limited, retried, authenticated request through the account's pooled async client.
+
+    Returns None on failure. Raises AuthenticationRequiredError if there are no
+    cookies or Amazon rejects them (including while the auth circuit is open).
+    """
+    account = account or accounts.default
+    method = method.upper()
+    if method not in SUPPORTED_METHODS:
+        logger.error(f"Unsupported method specified: {method}")
+        return None
+
+    cookies = account.cookie_store.get_jar()
+    if not cookies:
+        logger.error(f"No cookies loaded from {account.cookie_store.cookie_file_path} for authenticated request.")
+        raise AuthenticationRequiredError("Amazon authentication required: no cookies loaded.")
+
+    auth_breaker = account.auth_breaker
+    is_probe = auth_breaker.before_request()
+    try:
+        logger.debug(f"Making {method} request to {url}")
+        if payload is not None:
+            logger.debug(f"{method} payload: {payload}")
+
+        attempt = 0
+        while True:
+            wait = account.rate_limiter.reserve()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            try:
+                response = await get_async_alexa_client(account).request(method, url, payload=payload, cookies=cookies)
+            except httpx.TransportError as err:
+                delay = retry_policy.delay_for_error(method, classify_request_error(err), attempt)
+                if delay is None:
+                    raise
+                logger.warning(f"{method} {url} failed ({err!r}); retrying in {delay:.2f}s")
+            else:
+                if response.status_code < 400:
+                    logger.debug(f"Request successful ({response.status_code})")
+                    auth_breaker.record_success()
+                    account.cookie_store.merge_response_cookies(response.cookies.jar)
+                    return response
+                if response.status_code in AUTH_FAILURE_STATUS_CODES:
+                    auth_breaker.record_auth_failure()
+                    raise AuthenticationRequiredError(
+                        f"Amazon authentication required: cookies rejected ({response.status_code})."
+                    )
+                delay = retry_policy.delay_for_status(
+                    method, response.status_code, response.headers.get('Retry-After'), attempt
+                )
+                if delay is None:
+                    raise httpx.HTTPStatusError(
+                        f"{response.status_code} Error: {response.reason_phrase} for url: {url}",
+                        request=response.request, response=response
+                    )
+                logger.warning(f"{method} {url} returned {response.status_code}; retrying in {delay:.2f}s")
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    except AuthenticationRequiredError:
+        raise
+    except httpx.HTTPError as err:
+        logger.error(f"HTTP request failed: {err!r}")
+        return None
+    except Exception as e:
+        logger.exception(f"Unexpected error during authenticated request: {e}")
+        return None
+    finally:
+        if is_probe:
+            # A no-op once the probe settled the breaker; frees it after other failures or cancellation
+            auth_breaker.release_probe()
+
+# --- Request Coalescing ---
+class SingleFlight:
+    """Coalesces concurrent identical async calls so only one runs at a time per key.
+
+    Callers arriving while a call for the same key is in flight await that call
+    and share its result (or exception) instead of starting their own.
+    """
+
+    def __init__(self):
+        self.leaders = 0
+        self.coalesced = 0
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._inflight.get(key)
+        if task is None:
+            self.leaders += 1
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done, key=key: self._forget(key, done))
+        else:
+            self.coalesced += 1
+            logger.debug(f"Joining in-flight request for {key}")
+        # Shield so one cancelled caller does not cancel the call for everyone else
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns how many calls were executed vs. served from an in-flight call."""
+        return {"executed": self.leaders, "coalesced": self.coalesced, "in_flight": len(self._inflight)}
+
+list_fetches = SingleFlight()
+
+# --- Shopping List Functions ---
+
+async def fetch_list_snapshot(list_id: Optional[str] = None, use_cache: bool = True, account: Optional[Account] = None) -> Optional[ListSnapshot]:
+    """Returns the current snapshot of a list, from the account's cache when fresh."""
+    account = account or accounts.default
+    if use_cache:
+        cached = account.list_cache.get(list_id)
+        if cached is not None:
+            return cached
+
+    url = list_items_url(account, list_id)
+    generation = account.list_cache.generation(list_id)
+
+    async def fetch() -> Optional[ListSnapshot]:
+        response = await make_authenticated_request(url, method='GET', account=account)
+        if not response:
+            logger.error("Failed to retrieve shopping list data.")
+            return None
+
+        response_data = decode_list_items_response(response)
+        if response_data is None:
+            return None
+        snapshot = ListSnapshot(response_data)
+        record_list_fetched(account, list_id, snapshot, generation)
+        return snapshot
+
+    # Concurrent callers for the same list and account share one upstream GET,
+    # but never one that started before a mutation they may have seen
+    return await list_fetches.do((account.account_id, url, generation), fetch)
+
+async def fetch_list_snapshots(list_ids: List[str], use_cache: bool = True, account: Optional[Account] = None) -> List[Optional[ListSnapshot]]:
+    """Fetches several lists concurrently, at most LISTS_FETCH_CONCURRENCY at a time, preserving order."""
+    semaphore = asyncio.Semaphore(api_config.LISTS_FETCH_CONCURRENCY)
+
+    async def fetch(list_id: str) -> Optional[ListSnapshot]:
+        async with semaphore:
+            return await fetch_list_snapshot(list_id, use_cache=use_cache, account=account)
+
+    return await asyncio.gather(*(fetch(list_id) for list_id in list_ids))
+
+async def get_all_shopping_lists(account: Optional[Account] = None) -> Optional[List[Dict[str, Any]]]:
+    """Gets all available Alexa shopping lists by extracting unique list IDs from items."""
+    logger.info("Getting all shopping lists by extracting from items...")
+
+    snapshot = await fetch_list_snapshot(account=account)
+    if snapshot is None:
+        logger.error("Failed to retrieve data to extract list information.")
+        return None
+    return build_lists_from_response(snapshot.response_data)
+
+async def get_shopping_list_items(list_id: Optional[str] = None, use_cache: bool = True, account: Optional[Account] = None) -> Optional[List[Dict[str, Any]]]:
+    """Gets all items from the Alexa shopping list. If list_id is provided, gets items from that specific list."""
+    return items_from_snapshot(await fetch_list_snapshot(list_id, use_cache=use_cache, account=account))
+
+async def get_item_index(list_id: Optional[str] = None, account: Optional[Account] = None) -> Optional[ItemIndex]:
+    """Gets the name index for a list's current snapshot, for O(1) lookups by item name."""
+    snapshot = await fetch_list_snapshot(list_id, account=account)
+    if snapshot is None:
+        return None
+    return snapshot.index
+
+async def resolve_primary_list_id(refresh: bool = False, account: Optional[Account] = None) -> Optional[str]:
+    """Returns the primary list ID, resolving it from list metadata on first use or when refresh is set."""
+    account = account or accounts.default
+    if not refresh and account.primary_list_id:
+        return account.primary_list_id
+
+    snapshot = await fetch_list_snapshot(use_cache=not refresh, account=account)
+    if snapshot is None:
+        logger.error("Cannot resolve primary list ID: failed to retrieve list data")
+        return None
+    list_id = primary_list_id_from_response(snapshot.response_data)
+    account.remember_primary_list_id(list_id)
+    return list_id
+
+async def add_shopping_list_item_to_list(list_id: str, item_value: str, account: Optional[Account] = None) -> bool:
+    """Adds a new item to a specific Alexa list."""
+    account = account or accounts.default
+    logger.info(f"Adding item to list {list_id}: {item_value}")
+    url, payload = add_item_request(account, list_id, item_value)
+    response = await make_authenticated_request(url, method='POST', payload=payload, account=account)
+
+    if check_mutation_response(response, (200,), f"Failed to add item: {item_value}"):
+        logger.info(f"Successfully added item: {item_value}")
+        record_item_added(account, list_id, added_item_from_response(response))
+        return True
+    return False
+
+async def add_shopping_list_item(item_value: str, account: Optional[Account] = None) -> bool:
+    """Adds a new item to the primary Alexa shopping list."""
+    list_id = await resolve_primary_list_id(account=account)
+    if not list_id:
+        logger.error("Cannot add item: Could not determine the shopping list ID")
+        return False
+
+    if await add_shopping_list_item_to_list(list_id, item_value, account=account):
+        return True
+
+    # The cached ID may be stale; re-resolve once and retry if it changed
+    fresh_list_id = await resolve_primary_list_id(refresh=True, account=account)
+    if fresh_list_id and fresh_list_id != list_id:
+        logger.info(f"Primary list ID changed ({list_id} -> {fresh_list_id}); retrying add.")
+        return await add_shopping_list_item_to_list(fresh_list_id, item_value, account=account)
+    return False
+
+async def mark_item_as_completed(list_item: Dict[str, Any], account: Optional[Account] = None) -> bool:
+    """Marks a specific shopping list item as completed via the API."""
+    return await _update_item_completion_status(list_item, completed_status=True, account=account)
+
+async def delete_shopping_list_item(list_item: Dict[str, Any], account: Optional[Account] = None) -> bool:
+    """Deletes a specific shopping list item via the API."""
+    account = account or accounts.default
+    item_value = list_item.get('value', 'unknown')
+    item_id = list_item.get('id')
+
+    if not item_id:
+        logger.error(f"Cannot delete item '{item_value}' without an ID.")
+        return False
+
+    logger.info(f"Deleting item: {item_value} (ID: {item_id})")
+    response = await make_authenticated_request(delete_item_url(account), method='DELETE', payload=list_item, account=account)
+
+    if check_mutation_response(response, (200, 204), f"Failed to delete item: {item_value}"):
+        logger.info(f"Successfully deleted item: {item_value}")
+        record_item_deleted(account, list_item)
+        return True
+    return False
+
+async def unmark_item_as_completed(list_item: Dict[str, Any], account: Optional[Account] = None) -> bool:
+    """Unmarks a specific shopping list item as completed via the API."""
+    return await _update_item_completion_status(list_item, completed_status=False, account=account)
+
+async def _update_item_completion_status(list_item: Dict[str, Any], completed_status: bool, account: Optional[Account] = None) -> bool:
+    """Internal helper to update the completed status of an item."""
+    account = account or accounts.default
+    item_value = list_item.get('value', 'unknown')
+    action = "Marking" if completed_status else "Unmarking"
+    action_past = "marked" if completed_status else "unmarked"
+
+    logger.info(f"{action} item as completed: {item_value}")
+    url, payload = update_item_request(account, list_item, completed_status)
+    response = await make_authenticated_request(url, method='PUT', payload=payload, account=account)
+
+    if check_mutation_response(response, (200,), f"Failed to {action.lower()} item as completed: {item_value}"):
+        logger.info(f"Successfully {action_past} item as completed: {item_value}")
+        record_item_updated(account, list_item, completed_status)
+        return True
+    return False
@@ -15,12 +15,125 @@ COOKIE_PATH = "/app/data/cookies.json"
 # Needs to match the one used for login to construct API paths correctly.
 AMAZON_URL = "https://www.amazon.com"
 
+# Cookies Amazon refreshes in responses are written back to the cookie file at
+# most once per this many seconds (they take effect in memory immediately)
+COOKIE_PERSIST_DELAY_SECONDS = 10.0
+
+# --- Accounts --- #
+# One API process can serve several Amazon accounts. A request selects one with
+# the ACCOUNT_HEADER header or an /accounts/{account_id}/... route prefix, and
+# otherwise uses the default account, whose cookies live at COOKIE_PATH.
+DEFAULT_ACCOUNT_ID = "default"
+ACCOUNT_HEADER = "X-Alexa-Account"
+# Cookies for other accounts are stored at ACCOUNTS_DIR/<account_id>/cookies.json
+ACCOUNTS_DIR = "/app/data/accounts"
+# Amazon URL per account ID, for accounts whose locale differs from AMAZON_URL,
+# e.g. {"uk-household": "https://www.amazon.co.uk"}
+ACCOUNT_AMAZON_URLS = {}
+
 # Logging level for the API server
 LOG_LEVEL = "INFO"
 
 # Port the API server listens on inside the container
 API_PORT = 8000
 
+# --- Response Encoding --- #
+# Responses larger than this many bytes are compressed: brotli when the client
+# accepts it, gzip otherwise. Quality trades CPU for size (0-11).
+RESPONSE_COMPRESSION_MIN_BYTES = 1024
+RESPONSE_BROTLI_QUALITY = 4
+
+# --- Upstream HTTP Client --- #
+# Connection pool sizing for the long-lived session used for Amazon calls.
+# POOL_CONNECTIONS is the number of hosts cached, POOL_MAXSIZE the number of
+# keep-alive connections kept per host.
+HTTP_POOL_CONNECTIONS = 4
+HTTP_POOL_MAXSIZE = 16
+
+# Timeouts (in seconds) for requests to Amazon
+HTTP_CONNECT_TIMEOUT = 5.0
+HTTP_READ_TIMEOUT = 15.0
+
+# --- Upstream Rate Limiting & Retries --- #
+# Token bucket applied to every Amazon call: sustained requests per second and
+# the burst allowed on top. Set the rate to 0 to disable pacing.
+UPSTREAM_RATE_LIMIT_PER_SECOND = 5.0
+UPSTREAM_RATE_LIMIT_BURST = 10
+
+# Retries for transient failures (connection errors, timeouts, 429/5xx).
+# Delays grow exponentially from the base with full jitter, capped at the max;
+# a Retry-After header from Amazon takes precedence, and one asking for longer
+# than the max gives up instead of retrying early. 401/403 are never retried.
+UPSTREAM_MAX_RETRIES = 3
+UPSTREAM_RETRY_BASE_DELAY = 0.5
+UPSTREAM_RETRY_MAX_DELAY = 10.0
+
+# --- Auth Circuit Breaker --- #
+# After Amazon rejects the cookies (401/403), calls fail fast without reaching
+# Amazon. Every this many seconds a single probe request is let through to
+# check whether the session recovered. New cookies reset the breaker at once.
+AUTH_BREAKER_PROBE_INTERVAL_SECONDS = 300.0
+
+# --- Shopping List Cache --- #
+# How long (in seconds) a fetched list is served from memory before Amazon is
+# queried again. Successful mutations patch or invalidate the cached list.
+# Set to 0 to disable caching.
+LIST_CACHE_TTL_SECONDS = 30.0
+# Number of filtered/sorted/projected item views memoized per cached list
+LIST_VIEW_CACHE_SIZE = 32
+
+# Maximum number of lists fetched concurrently by GET /lists?include_items=true
+LISTS_FETCH_CONCURRENCY = 4
+
+# --- List Mirror --- #
+# Keep a SQLite copy of every fetched list so reads can still be answered (marked
+# stale) when Amazon can't be reached, e.g. while cookies are expired. It is
+# refreshed by every fetch (including the keep-alive job) and by mutations.
+LIST_MIRROR_ENABLED = False
+LIST_MIRROR_PATH = "/app/data/list_mirror.sqlite3"
+
+# --- Item Name Matching --- #
+# Endpoints that act on an item by name fall back to names equal after folding
+# accents, punctuation, plurals and word order when no item has exactly that
+# (case-insensitive) name. They never act on a merely similar name; instead the
+# most similar item whose trigram similarity (0..1) is at or above this
+# threshold is suggested in the not-found message. Set to 1.0 to disable
+# suggestions.
+ITEM_MATCH_THRESHOLD = 0.75
+
+# --- Item Pagination --- #
+# Upper bound for the limit= query parameter on item endpoints
+ITEMS_MAX_PAGE_SIZE = 500
+
+# --- Batch Endpoints --- #
+# Maximum number of concurrent Amazon calls made by one batch request
+BATCH_CONCURRENCY = 5
+
+# --- Idempotency Keys --- #
+# Outcomes of mutation requests sent with an Idempotency-Key header are kept
+# this long (and at most this many), so client retries are replayed rather
+# than applied twice.
+IDEMPOTENCY_KEY_TTL_SECONDS = 86400.0
+IDEMPOTENCY_MAX_KEYS = 10000
+
+# --- Async Mutations --- #
+# Mutation requests sent with `Prefer: respond-async` are journaled to this
+# SQLite queue and acknowledged with 202 and an operation ID; a background
+# worker applies them to Amazon (in order per item) and GET /operations/{id}
+# reports their status. Set OPERATION_QUEUE_ENABLED to False to ignore the header.
+OPERATION_QUEUE_ENABLED = True
+OPERATION_QUEUE_PATH = "/app/data/operations.sqlite3"
+# Operations applied per worker pass (run at most BATCH_CONCURRENCY at a time)
+OPERATION_BATCH_SIZE = 20
+# Attempts before an operation is marked failed; retries back off exponentially
+OPERATION_MAX_ATTEMPTS = 5
+OPERATION_RETRY_BASE_DELAY = 2.0
+OPERATION_RETRY_MAX_DELAY = 300.0
+# How often the worker checks for operations that are due for a retry
+OPERATION_POLL_INTERVAL_SECONDS = 1.0
+# How long finished operations stay queryable
+OPERATION_RETENTION_SECONDS = 86400.0
+
 # --- Derived --- #
 LOG_LEVEL_INT = getattr(logging, LOG_LEVEL.upper(), logging.INFO)
 
@@ -0,0 +1,176 @@
+"""Idempotency-Key support for mutation endpoints.
+
+A client that retries a POST/PUT/DELETE with the same Idempotency-Key header
+gets the stored outcome of the first attempt instead of a second Amazon call.
+Keys are scoped to the method, path and account header, expire after a TTL and
+are capped in number. A duplicate that arrives while the first attempt is still
+running waits for it. Reusing a key with a different body is rejected with 422.
+"""
+
+import asyncio
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from typing import Optional, Dict, Any, List, Tuple
+
+from .responses import FastJSONResponse
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENCY_HEADER = b"idempotency-key"
+MUTATING_METHODS = frozenset({"POST", "PUT", "PATCH", "DELETE"})
+MAX_KEY_LENGTH = 255
+
+# (status, raw headers, body) of a completed response
+StoredResponse = Tuple[int, List[Tuple[bytes, bytes]], bytes]
+
+def is_storable(status: int) -> bool:
+    """Server errors, auth failures and rate limiting left the list untouched, so a retry should run again."""
+    return status < 500 and status not in (401, 429)
+
+class _IdempotencyEntry:
+    __slots__ = ('fingerprint', 'expires_at', 'done', 'response')
+
+    def __init__(self, fingerprint: str, expires_at: float):
+        self.fingerprint = fingerprint
+        self.expires_at = expires_at
+        self.done = asyncio.Event()
+        self.response: Optional[StoredResponse] = None
+
+class IdempotencyStore:
+    """Bounded, TTL-evicted map of idempotency keys to request fingerprints and outcomes.
+
+    Only used from the event loop, so it needs no locking. Entries are kept in
+    insertion order, which is also expiry order.
+    """
+
+    def __init__(self, ttl_seconds: float, max_keys: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_keys = max_keys
+        self.stored = 0
+        self.replays = 0
+        self.conflicts = 0
+        self._entries: "OrderedDict[tuple, _IdempotencyEntry]" = OrderedDict()
+
+    def _evict(self, now: float) -> None:
+        while self._entries:
+            oldest = next(iter(self._entries.values()))
+            if oldest.expires_at > now and len(self._entries) < self.max_keys:
+                break
+            self._entries.popitem(last=False)
+
+    def begin(self, key: tuple, fingerprint: str) -> Tuple[_IdempotencyEntry, bool]:
+        """Returns the entry for a key and whether the caller owns it (i.e. must run the request)."""
+        now = time.monotonic()
+        entry = self._entries.get(key)
+        if entry is not None and entry.expires_at > now:
+            return entry, False
+        self._evict(now)
+        entry = _IdempotencyEntry(fingerprint, now + self.ttl_seconds)
+        self._entries[key] = entry
+        return entry, True
+
+    def finish(self, key: tuple, entry: _IdempotencyEntry, response: Optional[StoredResponse]) -> None:
+        """Records the owner's outcome (None if it should not be replayed) and wakes waiting duplicates."""
+        if response is None:
+            if self._entries.get(key) is entry:
+                del self._entries[key]
+        else:
+            entry.response = response
+            self.stored += 1
+        entry.done.set()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"keys": len(self._entries), "stored": self.stored, "replays": self.replays, "conflicts": self.conflicts}
+
+class IdempotencyMiddleware:
+    """ASGI middleware applying an IdempotencyStore to mutating requests that carry an Idempotency-Key."""
+
+    def __init__(self, app, store: IdempotencyStore, scope_headers: Tuple[str, ...] = ()):
+        self.app = app
+        self.store = store
+        self.scope_headers = tuple(name.lower().encode('latin-1') for name in scope_headers)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in MUTATING_METHODS:
+            await self.app(scope, receive, send)
+            return
+        headers = dict(scope["headers"])
+        idempotency_key = headers.get(IDEMPOTENCY_HEADER)
+        if not idempotency_key:
+            await self.app(scope, receive, send)
+            return
+        if len(idempotency_key) > MAX_KEY_LENGTH:
+            response = FastJSONResponse(status_code=400, content={"detail": f"Idempotency-Key must be at most {MAX_KEY_LENGTH} characters."})
+            await response(scope, receive, send)
+            return
+
+        # Buffer the body so it can be fingerprinted and then handed to the app
+        body = b""
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return
+            body += message.get("body", b"")
+            if not message.get("more_body", False):
+                break
+        fingerprint = hashlib.sha256(body).hexdigest()
+        key = (scope["method"], scope["path"], *(headers.get(name) for name in self.scope_headers), idempotency_key)
+
+        while True:
+            entry, owner = self.store.begin(key, fingerprint)
+            if entry.fingerprint != fingerprint:
+                self.store.conflicts += 1
+                response = FastJSONResponse(
+                    status_code=422,
+                    content={"detail": "Idempotency-Key was already used with a different request body."}
+                )
+                await response(scope, receive, send)
+                return
+            if owner:
+                break
+            await entry.done.wait()
+            if entry.response is not None:
+                self.store.replays += 1
+                await self._replay(entry.response, send)
+                return
+            # The first attempt had no lasting effect; run this one for real
+
+        await self._run(scope, receive, send, body, key, entry)
+
+    async def _run(self, scope, receive, send, body: bytes, key: tuple, entry: _IdempotencyEntry) -> None:
+        body_sent = False
+
+        async def replay_receive():
+            nonlocal body_sent
+            if not body_sent:
+                body_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        status = 500
+        response_headers: List[Tuple[bytes, bytes]] = []
+        chunks: List[bytes] = []
+
+        async def capture_send(message):
+            nonlocal status, response_headers
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                response_headers = list(message.get("headers", []))
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+            await send(message)
+
+        stored: Optional[StoredResponse] = None
+        try:
+            await self.app(scope, replay_receive, capture_send)
+            if is_storable(status):
+                stored = (status, response_headers, b"".join(chunks))
+        finally:
+            self.store.finish(key, entry, stored)
+
+    async def _replay(self, response: StoredResponse, send) -> None:
+        status, headers, body = response
+        await send({"type": "http.response.start", "status": status, "headers": headers + [(b"idempotent-replayed", b"true")]})
+        await send({"type": "http.response.body", "body": body})
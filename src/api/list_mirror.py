@@ -0,0 +1,189 @@
+"""SQLite mirror of fetched shopping lists, so reads can still be answered while Amazon can't."""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+from typing import Optional, Dict, Any, Tuple
+
+logger = logging.getLogger(__name__)
+
+# One row per fetched list (list_key '' is the default list). The response
+# body minus its item array is kept as `shell`; items are stored as rows so
+# mutations can be applied to them in place. Name and completion lookups are
+# served by the in-memory ItemIndex of the snapshot restored from these rows.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS lists (
+    account_id TEXT NOT NULL,
+    list_key TEXT NOT NULL,
+    items_key TEXT NOT NULL,
+    shell TEXT NOT NULL,
+    etag TEXT,
+    fetched_at REAL NOT NULL,
+    PRIMARY KEY (account_id, list_key)
+);
+CREATE TABLE IF NOT EXISTS items (
+    account_id TEXT NOT NULL,
+    list_key TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    item_id TEXT,
+    list_id TEXT,
+    completed INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (account_id, list_key, position)
+);
+CREATE INDEX IF NOT EXISTS items_by_item_id ON items (account_id, item_id);
+"""
+
+def _list_key(list_id: Optional[str]) -> str:
+    return list_id or ''
+
+class ListMirror:
+    """Persists the latest snapshot of every fetched list and applies successful mutations to it.
+
+    The database is opened on first use. Calls are serialized on one connection;
+    each write is a single short transaction.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self.writes = 0
+        self.reads = 0
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.db_path) or '.', exist_ok=True)
+            conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(SCHEMA)
+            self._conn = conn
+            logger.info(f"Opened list mirror at {self.db_path}.")
+        return self._conn
+
+    def _item_row(self, account_id: str, list_key: str, position: int, item: Dict[str, Any]) -> tuple:
+        return (
+            account_id, list_key, position,
+            item.get('id'), item.get('listId'),
+            1 if item.get('completed', False) else 0,
+            json.dumps(item, separators=(',', ':'))
+        )
+
+    def store(self, account_id: str, list_id: Optional[str], response_data: Dict[str, Any], etag: str, fetched_at: float) -> None:
+        """Replaces the mirrored copy of a list with a freshly fetched response."""
+        items_key = next(
+            (key for key, value in response_data.items() if isinstance(value, dict) and 'listItems' in value),
+            None
+        )
+        if items_key is None:
+            return
+        shell = dict(response_data)
+        shell[items_key] = {k: v for k, v in response_data[items_key].items() if k != 'listItems'}
+        items = response_data[items_key]['listItems'] or []
+        list_key = _list_key(list_id)
+
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.execute("BEGIN")
+                conn.execute(
+                    "INSERT OR REPLACE INTO lists VALUES (?, ?, ?, ?, ?, ?)",
+                    (account_id, list_key, items_key, json.dumps(shell, separators=(',', ':')), etag, fetched_at)
+                )
+                conn.execute("DELETE FROM items WHERE account_id = ? AND list_key = ?", (account_id, list_key))
+                conn.executemany(
+                    "INSERT INTO items VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    [self._item_row(account_id, list_key, position, item) for position, item in enumerate(items)]
+                )
+            self.writes += 1
+
+    def load(self, account_id: str, list_id: Optional[str]) -> Optional[Tuple[Dict[str, Any], Optional[str], float]]:
+        """Returns (response_data, etag, fetched_at) for a mirrored list, or None if it was never stored.
+
+        The etag is None if mutations were applied since the list was fetched.
+        """
+        list_key = _list_key(list_id)
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute(
+                "SELECT items_key, shell, etag, fetched_at FROM lists WHERE account_id = ? AND list_key = ?",
+                (account_id, list_key)
+            ).fetchone()
+            if row is None:
+                return None
+            items = conn.execute(
+                "SELECT data FROM items WHERE account_id = ? AND list_key = ? ORDER BY position",
+                (account_id, list_key)
+            ).fetchall()
+            self.reads += 1
+        items_key, shell, etag, fetched_at = row
+        response_data = json.loads(shell)
+        response_data[items_key] = dict(response_data[items_key], listItems=[json.loads(data) for (data,) in items])
+        return response_data, etag, fetched_at
+
+    def _touch_lists(self, conn: sqlite3.Connection, account_id: str, where: str, params: tuple) -> None:
+        # Stored ETags no longer describe lists whose items were changed in place
+        conn.execute(
+            f"UPDATE lists SET etag = NULL WHERE account_id = ? AND list_key IN (SELECT list_key FROM items WHERE account_id = ? AND {where})",
+            (account_id, account_id) + params
+        )
+
+    def add_item(self, account_id: str, item: Dict[str, Any], include_default_list: bool) -> None:
+        """Appends a newly added item to its mirrored list (and the default list, if it is the primary list)."""
+        list_keys = [_list_key(item.get('listId'))]
+        if include_default_list:
+            list_keys.append('')
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.execute("BEGIN")
+                for list_key in list_keys:
+                    if conn.execute("SELECT 1 FROM lists WHERE account_id = ? AND list_key = ?", (account_id, list_key)).fetchone() is None:
+                        continue
+                    (position,) = conn.execute(
+                        "SELECT COALESCE(MAX(position), -1) + 1 FROM items WHERE account_id = ? AND list_key = ?",
+                        (account_id, list_key)
+                    ).fetchone()
+                    conn.execute("INSERT INTO items VALUES (?, ?, ?, ?, ?, ?, ?)", self._item_row(account_id, list_key, position, item))
+                    conn.execute("UPDATE lists SET etag = NULL WHERE account_id = ? AND list_key = ?", (account_id, list_key))
+            self.writes += 1
+
+    def remove_item(self, account_id: str, item_id: str) -> None:
+        """Removes a deleted item from every mirrored list."""
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.execute("BEGIN")
+                self._touch_lists(conn, account_id, "item_id = ?", (item_id,))
+                conn.execute("DELETE FROM items WHERE account_id = ? AND item_id = ?", (account_id, item_id))
+            self.writes += 1
+
+    def update_item(self, account_id: str, item_id: str, completed: bool) -> None:
+        """Records an item's new completion state in every mirrored list."""
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.execute("BEGIN")
+                self._touch_lists(conn, account_id, "item_id = ?", (item_id,))
+                conn.execute(
+                    "UPDATE items SET completed = ?, data = json_set(data, '$.completed', json(?)) WHERE account_id = ? AND item_id = ?",
+                    (1 if completed else 0, 'true' if completed else 'false', account_id, item_id)
+                )
+            self.writes += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lists, items = (0, 0)
+            if self._conn is not None:
+                (lists,) = self._conn.execute("SELECT COUNT(*) FROM lists").fetchone()
+                (items,) = self._conn.execute("SELECT COUNT(*) FROM items").fetchone()
+            return {"path": self.db_path, "lists": lists, "items": items, "reads": self.reads, "writes": self.writes}
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -1,8 +1,11 @@
 import sys
 import os
 import logging
-from typing import List, Dict, Any, Optional, Union
+from typing import List, Dict, Any, Optional, Union, Callable, Awaitable, Tuple, AsyncIterator
 import json # Added json for saving cookies
+import base64
+import hashlib
+import time
 
 # --- Path Modification ---
 # Add the project root directory to the Python path
@@ -12,7 +15,9 @@ if project_root not in sys.path:
     sys.path.append(project_root)
 # --- End Path Modification ---
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, APIRouter, HTTPException, Request, Depends, Query, Header
+from fastapi.responses import Response
+from brotli_asgi import BrotliMiddleware  # Brotli with gzip fallback
 from pydantic import BaseModel, Field  # For request body validation
 
 # --- Scheduler Imports ---
@@ -25,15 +30,37 @@ import asyncio # For potential sleep in task
 try:
     # Use the new local config
     from . import config as api_config # Alias to avoid name clashes
+    from .responses import FastJSONResponse
+    from .idempotency import IdempotencyStore, IdempotencyMiddleware
     from .alexa_api import ( # Relative import
-        get_shopping_list_items,
-        get_all_shopping_lists,
+        build_lists_from_response,
+        embed_list_items,
+        ListSnapshot,
+        Account,
+        accounts,
+        UnknownAccountError,
+        retry_policy,
+        AuthenticationRequiredError,
+        ItemIndex,
+        ITEM_SORT_KEYS,
+        parse_item_fields,
+        list_mirror,
+        load_mirrored_snapshot,
+        normalize_item_name,
+    )
+    from .operation_queue import OperationQueue, OperationWorker, PermanentOperationError, DeferOperation
+    # Async variants so Amazon round-trips don't block the event loop
+    from .alexa_api_async import (
+        fetch_list_snapshot,
+        fetch_list_snapshots,
         add_shopping_list_item,
+        add_shopping_list_item_to_list,
+        resolve_primary_list_id,
         delete_shopping_list_item,
         mark_item_as_completed,
         unmark_item_as_completed,
-        filter_incomplete_items,
-        # No filter_completed_items, we'll do it inline
+        close_async_alexa_clients,
+        list_fetches,
     )
 except ImportError as e:
     print(f"FATAL ERROR: Could not import alexa_shopping_list modules: {e}", file=sys.stderr)
@@ -61,62 +88,477 @@ if api_config.LOG_LEVEL_INT > logging.DEBUG:
 # --- Scheduler Setup ---
 scheduler = AsyncIOScheduler()
 
-async def perform_keep_alive():
-    """Task to periodically fetch shopping list to keep session active."""
-    logger.info("Keep-alive task started: Attempting to fetch shopping list...")
-
+async def keep_alive_account(account: Account) -> bool:
+    """Fetches one account's shopping list to keep its session active."""
     # Check if cookies exist before attempting the request
-    cookie_path = api_config.COOKIE_PATH
+    cookie_path = account.cookie_store.cookie_file_path
     if not os.path.exists(cookie_path):
-        logger.info(f"Keep-alive skipped: Cookie file not found at {cookie_path}. Login required.")
-        return # Skip this interval
+        logger.info(f"Keep-alive skipped for account '{account.account_id}': Cookie file not found at {cookie_path}. Login required.")
+        return False
 
     try:
-        # Call the function that gets all items, which uses make_authenticated_request
-        items = get_shopping_list_items()
-        if items is not None:
-            logger.info(f"Keep-alive successful: Fetched {len(items)} items.")
-        else:
-            # This likely means cookies are invalid/expired or another API error occurred
-            logger.warning("Keep-alive failed: Could not retrieve shopping list (cookies might be expired). Re-authentication needed.")
+        # Call the function that gets all items, bypassing the cache so Amazon is actually hit
+        snapshot = await fetch_list_snapshot(use_cache=False, account=account)
+        if snapshot is not None and snapshot.items is not None:
+            logger.info(f"Keep-alive successful for account '{account.account_id}': Fetched {len(snapshot.items)} items.")
+            if list_mirror is not None:
+                # Refresh the other lists too, so the mirror has every list
+                lists = build_lists_from_response(snapshot.response_data) or []
+                if len(lists) > 1:
+                    await fetch_list_snapshots([list_data['listId'] for list_data in lists], use_cache=False, account=account)
+            return True
+        logger.warning(f"Keep-alive failed for account '{account.account_id}': Could not retrieve shopping list.")
+    except AuthenticationRequiredError:
+        # Cookies are expired; the auth circuit breaker keeps this from reaching Amazon until it probes
+        logger.warning(f"Keep-alive failed for account '{account.account_id}': Amazon authentication required. Re-authentication needed.")
     except Exception as e:
         # Catch any unexpected error during the keep-alive attempt
-        logger.error(f"Keep-alive task encountered an unexpected error: {e}", exc_info=True)
+        logger.error(f"Keep-alive task encountered an unexpected error for account '{account.account_id}': {e}", exc_info=True)
+    return False
+
+async def perform_keep_alive():
+    """Task to periodically fetch every account's shopping list to keep the sessions active."""
+    logger.info("Keep-alive task started: Attempting to fetch shopping lists...")
+    await gather_bounded([lambda account=account: keep_alive_account(account) for account in accounts.all()])
 
 @asynccontextmanager
-async def lifespan(app: FastAPI):
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     # Startup
     logger.info("Starting keep-alive scheduler...")
     # Schedule the job to run every 60 seconds
     scheduler.add_job(perform_keep_alive, 'interval', seconds=60, id='keep_alive_job')
     scheduler.start()
+    if operation_worker is not None:
+        try:
+            operation_worker.start()
+        except Exception as e:
+            logger.error(f"Could not start the operation queue worker: {e}", exc_info=True)
     yield
     # Shutdown
     logger.info("Shutting down keep-alive scheduler...")
     scheduler.shutdown()
+    if operation_worker is not None:
+        await operation_worker.stop()
+    if operation_queue is not None:
+        operation_queue.close()
+    await close_async_alexa_clients()
+    for account in accounts.all():
+        account.cookie_store.flush()  # Write cookies refreshed since the last debounced write
+    if list_mirror is not None:
+        list_mirror.close()
 
 # --- FastAPI App Instance ---
 app = FastAPI(
     title="Alexa Shopping List API",
     description="API to interact with an Alexa Shopping List using pre-generated cookies.",
     version="1.0.0",
-    lifespan=lifespan # Add the lifespan manager
+    lifespan=lifespan, # Add the lifespan manager
+    default_response_class=FastJSONResponse # orjson instead of the stdlib encoder
 )
+# Replays retried mutations that carry an Idempotency-Key. Added before the
+# compression middleware so stored responses are kept uncompressed.
+idempotency_store = IdempotencyStore(api_config.IDEMPOTENCY_KEY_TTL_SECONDS, api_config.IDEMPOTENCY_MAX_KEYS)
+app.add_middleware(IdempotencyMiddleware, store=idempotency_store, scope_headers=(api_config.ACCOUNT_HEADER,))
+app.add_middleware(
+    BrotliMiddleware,
+    quality=api_config.RESPONSE_BROTLI_QUALITY,
+    minimum_size=api_config.RESPONSE_COMPRESSION_MIN_BYTES
+)
+
+@app.exception_handler(AuthenticationRequiredError)
+async def authentication_required_handler(request: Request, exc: AuthenticationRequiredError):
+    """Maps expired/missing Amazon cookies to a 401 that clients can recognize."""
+    logger.warning(f"{request.method} {request.url.path} failed: {exc}")
+    return FastJSONResponse(
+        status_code=401,
+        content={
+            "detail": f"{exc} Run login.sh to re-authenticate.",
+            "authentication_required": True
+        }
+    )
+
+@app.exception_handler(UnknownAccountError)
+async def unknown_account_handler(request: Request, exc: UnknownAccountError):
+    """Maps requests for accounts that were never set up to a 404."""
+    return FastJSONResponse(status_code=404, content={"detail": f"{exc} Upload cookies for it first."})
 
 # --- Helper Function ---
-def find_item_by_name(items: List[Dict[str, Any]], name: str) -> Dict[str, Any] | None:
-    """Finds the first item in a list matching the name (case-insensitive)."""
-    if items is None:
+# Mutations only act on exact or folded-equal names (a threshold of 1.0 skips
+# similarity matching), so "AA batteries" can never delete "AAA batteries";
+# similar names are only offered as suggestions.
+MUTATION_MATCH_THRESHOLD = 1.0
+
+def find_item_by_name(index: Optional[ItemIndex], name: str, completed: Optional[bool] = None) -> Dict[str, Any] | None:
+    """Finds the item a mutation by name should act on, optionally only completed or incomplete ones.
+
+    An exact case-insensitive match wins; otherwise an item whose folded name is equal (see ItemIndex.match).
+    """
+    if index is None:
+        return None
+    matches = index.match(name, completed=completed, threshold=MUTATION_MATCH_THRESHOLD)
+    return matches[0] if matches else None
+
+async def get_current_item_index(account: Account, misses: Callable[[ItemIndex], bool]) -> Optional[ItemIndex]:
+    """Gets the default list's name index, refetching it once if a cached snapshot misses an item.
+
+    A cached snapshot can be up to LIST_CACHE_TTL_SECONDS old, so it may not have
+    items just added from an Echo or the Alexa app yet; misses(index) tells
+    whether the caller failed to find something in it.
+    """
+    requested_at = time.time()
+    snapshot = await fetch_list_snapshot(account=account)
+    if snapshot is None:
         return None
-    for item in items:
-        if item.get("value", "").lower() == name.lower():
-            return item
-    return None
+    if snapshot.fetched_at < requested_at and misses(snapshot.index):
+        logger.info("Item not found in the cached shopping list; refetching it from Alexa.")
+        fresh = await fetch_list_snapshot(use_cache=False, account=account)
+        if fresh is not None:
+            return fresh.index
+    return snapshot.index
+
+def not_found_message(index: ItemIndex, name: str, completed: Optional[bool], message: str, exclude_ids: Optional[set] = None) -> str:
+    """Appends the most similar item name (ITEM_MATCH_THRESHOLD) to a not-found message, if there is one."""
+    for item in index.match(name, completed=completed):
+        if not exclude_ids or item.get('id') not in exclude_ids:
+            return f"{message} Did you mean '{item.get('value')}'?"
+    return message
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Checks an If-None-Match header against an entity tag (weak comparison)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+def conditional_json_response(
+    request: Request,
+    content_tag: str,
+    view: str,
+    build_payload: Callable[[], Any],
+    headers: Optional[Dict[str, str]] = None
+) -> Response:
+    """Returns 304 if the client already has this view of the data, else the JSON payload with its ETag.
+
+    content_tag identifies the underlying data (usually a snapshot's ETag). The payload is only built (and serialized) when it actually has to be sent.
+    """
+    # The same URL serves different accounts depending on the account header
+    headers = dict(headers or {}, ETag=f'"{content_tag}-{view}"', Vary=api_config.ACCOUNT_HEADER)
+    if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    # Returned directly, so FastAPI skips response_model validation and serialization
+    return FastJSONResponse(content=build_payload(), headers=headers)
+
+def encode_cursor(offset: int) -> str:
+    """Encodes a page offset as an opaque cursor."""
+    return base64.urlsafe_b64encode(f"o:{offset}".encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: Optional[str]) -> int:
+    """Decodes a cursor from encode_cursor(), raising 400 if it is malformed."""
+    if not cursor:
+        return 0
+    try:
+        decoded = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        prefix, offset = decoded.split(":", 1)
+        if prefix != "o" or int(offset) < 0:
+            raise ValueError(decoded)
+        return int(offset)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor.")
+
+class ItemViewParams:
+    """Query parameters shaping an item list response: projection, sort order and pagination."""
+
+    def __init__(
+        self,
+        fields: Optional[str] = Query(None, description="Comma-separated item fields to return, e.g. id,value,completed."),
+        sort: Optional[str] = Query(
+            None,
+            pattern=f"^-?({'|'.join(ITEM_SORT_KEYS)})$",
+            description=f"Sort by {', '.join(ITEM_SORT_KEYS)}; prefix with '-' for descending. Defaults to list order."
+        ),
+        limit: Optional[int] = Query(None, ge=1, le=api_config.ITEMS_MAX_PAGE_SIZE, description="Maximum number of items to return."),
+        cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page.")
+    ):
+        self.fields = parse_item_fields(fields)
+        self.sort = sort
+        self.limit = limit
+        self.offset = decode_cursor(cursor)
+
+    @property
+    def is_default(self) -> bool:
+        return self.fields is None and self.sort is None and self.limit is None and self.offset == 0
+
+    def view_key(self, view: str) -> str:
+        """Names this shape of a view for its ETag (plain view name when no parameters are given)."""
+        if self.is_default:
+            return view
+        shape = repr((self.fields, self.sort, self.limit, self.offset)).encode()
+        return f"{view}-{hashlib.sha1(shape).hexdigest()[:12]}"
+
+def item_view_page(snapshot: ListSnapshot, completed: Optional[bool], params: ItemViewParams) -> Tuple[List[Dict[str, Any]], Dict[str, str]]:
+    """Returns the page of the snapshot's items selected by the query parameters, with its paging headers."""
+    items = snapshot.view(completed=completed, sort=params.sort, fields=params.fields)
+    end = len(items) if params.limit is None else min(params.offset + params.limit, len(items))
+    headers = {"X-Total-Count": str(len(items))}
+    if end < len(items):
+        headers["X-Next-Cursor"] = encode_cursor(end)
+    return items[params.offset:end], headers
+
+def item_view_response(
+    request: Request,
+    snapshot: ListSnapshot,
+    view: str,
+    completed: Optional[bool],
+    params: ItemViewParams,
+    headers: Optional[Dict[str, str]] = None
+) -> Response:
+    """Returns a page of the snapshot's items, shaped by the query parameters.
+
+    The filtered/sorted/projected list is memoized on the snapshot, so repeated
+    requests against a cached list only slice it. X-Total-Count carries the
+    number of matching items and X-Next-Cursor the cursor for the next page.
+    """
+    page, page_headers = item_view_page(snapshot, completed, params)
+    return conditional_json_response(request, snapshot.etag, params.view_key(view), lambda: page, dict(headers or {}, **page_headers))
+
+async def gather_bounded(operations: List[Callable[[], Awaitable[bool]]]) -> List[Optional[bool]]:
+    """Runs Alexa operations concurrently, at most BATCH_CONCURRENCY at a time, preserving order.
+
+    Once Amazon asks for re-authentication, operations not started yet are
+    skipped; they and the rejected one report None, while finished ones keep
+    their result. If none succeeded, the AuthenticationRequiredError is raised
+    instead: nothing was applied, so the whole request can simply be retried.
+    """
+    semaphore = asyncio.Semaphore(api_config.BATCH_CONCURRENCY)
+    auth_error: Optional[AuthenticationRequiredError] = None
+
+    async def run(operation: Callable[[], Awaitable[bool]]) -> Optional[bool]:
+        nonlocal auth_error
+        async with semaphore:
+            if auth_error is not None:
+                return None
+            try:
+                return await operation()
+            except AuthenticationRequiredError as e:
+                auth_error = e
+                return None
+            except Exception as e:
+                logger.error(f"Batch operation failed unexpectedly: {e}", exc_info=True)
+                return False
+
+    outcomes = await asyncio.gather(*(run(operation) for operation in operations))
+    if auth_error is not None and True not in outcomes:
+        raise auth_error
+    return outcomes
+
+def requested_account_id(
+    request: Request,
+    x_alexa_account: Optional[str] = Header(None, alias=api_config.ACCOUNT_HEADER, description="Account to act on (defaults to the default account).")
+) -> Optional[str]:
+    """Reads the account ID from the /accounts/{account_id} route prefix or the account header."""
+    return request.path_params.get("account_id") or x_alexa_account
+
+def get_account(account_id: Optional[str] = Depends(requested_account_id)) -> Account:
+    """Selects the account a request acts on; unknown accounts are a 404."""
+    return accounts.get(account_id)
+
+def get_or_create_account(account_id: Optional[str] = Depends(requested_account_id)) -> Account:
+    """Like get_account, but sets up accounts that do not exist yet (for cookie uploads)."""
+    return accounts.get(account_id, create=True)
+
+async def read_list_snapshot(account: Account, list_id: Optional[str] = None) -> Tuple[Optional[ListSnapshot], Dict[str, str]]:
+    """Fetches a list for a read endpoint, falling back to the list mirror when Amazon can't be reached.
+
+    Returns the snapshot (None if neither source has it) and freshness headers:
+    Age (seconds since the data left Amazon) and, for mirrored data,
+    X-List-Stale with the reason the live list was unavailable.
+    """
+    stale_reason = None
+    try:
+        snapshot = await fetch_list_snapshot(list_id, account=account)
+    except AuthenticationRequiredError:
+        snapshot = load_mirrored_snapshot(account, list_id)
+        if snapshot is None:
+            raise
+        stale_reason = "authentication_required"
+    else:
+        if snapshot is None or snapshot.items is None:
+            snapshot = load_mirrored_snapshot(account, list_id)
+            stale_reason = "upstream_unavailable"
+    if snapshot is None or snapshot.items is None:
+        return None, {}
+
+    headers = {"Age": str(max(0, int(time.time() - snapshot.fetched_at)))}
+    if stale_reason:
+        logger.warning(f"Serving mirrored list {list_id or '(default)'} for account '{account.account_id}' ({stale_reason}).")
+        headers["X-List-Stale"] = stale_reason
+    return snapshot, headers
+
+async def require_list_snapshot(account: Account, list_id: Optional[str] = None, detail: Optional[str] = None) -> Tuple[ListSnapshot, Dict[str, str]]:
+    """Like read_list_snapshot (default list unless list_id is given), but raises 503 if the list is unavailable."""
+    snapshot, headers = await read_list_snapshot(account, list_id)
+    if snapshot is None:
+        if detail is None:
+            detail = f"Could not retrieve items for list {list_id} from Alexa." if list_id else "Could not retrieve shopping list from Alexa."
+        logger.error(f"Failed to retrieve list {list_id or '(default)'} from Alexa API.")
+        raise HTTPException(status_code=503, detail=detail)
+    return snapshot, headers
+
+# --- Item Mutations ---
+# Mutations on an existing item, by kind: (completion state the item must be in,
+# Alexa call, not-found / success / failure message formats)
+ITEM_MUTATIONS = {
+    "delete": (None, delete_shopping_list_item,
+               "Item '{}' not found.", "Item '{}' deleted successfully.", "Failed to delete item '{}'."),
+    "complete": (False, mark_item_as_completed,
+                 "Incomplete item '{}' not found.", "Item '{}' marked as completed.", "Failed to mark item '{}' as completed."),
+    "incomplete": (True, unmark_item_as_completed,
+                   "Completed item '{}' not found.", "Item '{}' marked as incomplete.", "Failed to mark item '{}' as incomplete."),
+}
+
+async def apply_item_mutation(account: Account, kind: str, item_name: str, list_id: Optional[str] = None) -> str:
+    """Applies one mutation ("add" or a key of ITEM_MUTATIONS) to Amazon and returns its success message.
+
+    Raises HTTPException 404 if the item to change is not on the list, 503 if the list
+    could not be fetched and 500 if Amazon rejects the change.
+    """
+    if kind == "add":
+        if list_id:
+            success = await add_shopping_list_item_to_list(list_id, item_name, account=account)
+            failure = f"Failed to add item '{item_name}' to list {list_id}."
+        else:
+            success = await add_shopping_list_item(item_name, account=account)
+            failure = f"Failed to add item '{item_name}'."
+        if not success:
+            logger.error(f"{failure} Alexa API call failed.")
+            raise HTTPException(status_code=500, detail=failure)
+        return f"Item '{item_name}' added successfully."
+
+    completed, operation, not_found, succeeded, failed = ITEM_MUTATIONS[kind]
+    item_index = await get_current_item_index(
+        account, lambda index: find_item_by_name(index, item_name, completed=completed) is None
+    )
+    if item_index is None:
+        # Not a 404: the item may well be there, and queued operations must retry
+        logger.error(f"Cannot {kind} '{item_name}': failed to retrieve the shopping list.")
+        raise HTTPException(status_code=503, detail="Could not retrieve shopping list from Alexa.")
+    item = find_item_by_name(item_index, item_name, completed=completed)
+    if not item:
+        detail = not_found_message(item_index, item_name, completed, not_found.format(item_name))
+        logger.warning(detail)
+        raise HTTPException(status_code=404, detail=detail)
+
+    if normalize_item_name(item.get('value') or '') != normalize_item_name(item_name):
+        logger.info(f"Matched '{item_name}' to item '{item.get('value')}'.")
+        item_name = item.get('value') or item_name
+
+    if not await operation(item, account=account):
+        logger.error(f"{failed.format(item_name)} Alexa API call failed.")
+        raise HTTPException(status_code=500, detail=failed.format(item_name))
+    return succeeded.format(item_name)
+
+# --- Async Mutations ---
+# With `Prefer: respond-async`, mutation endpoints journal the change and answer
+# 202 straight away; the worker started in the lifespan applies it later.
+operation_queue: Optional[OperationQueue] = (
+    OperationQueue(api_config.OPERATION_QUEUE_PATH) if api_config.OPERATION_QUEUE_ENABLED else None
+)
+
+async def added_by_earlier_attempt(account: Account, item_name: str, list_id: Optional[str]) -> bool:
+    """Checks a fresh copy of the list for the item of a queued add that was tried before.
+
+    A failed add may still have reached Amazon (e.g. the item was added but the
+    response timed out), so it is only sent again if the item is not on the list.
+    """
+    snapshot = await fetch_list_snapshot(list_id, use_cache=False, account=account)
+    if snapshot is None:
+        raise HTTPException(status_code=503, detail="Could not retrieve shopping list from Alexa.")
+    return snapshot.index.find(item_name, completed=False) is not None
+
+async def execute_operation(operation: Dict[str, Any]) -> str:
+    """Applies a queued operation, classifying failures for the worker's retry policy."""
+    try:
+        account = accounts.get(operation['account_id'])
+        # Any earlier attempt (or one cut short by a restart) leaves a message
+        if operation['kind'] == "add" and operation['message'] is not None:
+            if await added_by_earlier_attempt(account, operation['item_name'], operation['list_id']):
+                logger.info(f"Queued add of '{operation['item_name']}' already reached Alexa; not sending it again.")
+                return f"Item '{operation['item_name']}' added successfully."
+        return await apply_item_mutation(account, operation['kind'], operation['item_name'], operation['list_id'])
+    except UnknownAccountError as e:
+        raise PermanentOperationError(str(e))
+    except AuthenticationRequiredError as e:
+        # Wait for new cookies rather than burning attempts
+        raise DeferOperation(str(e))
+    except HTTPException as e:
+        if e.status_code == 404:
+            raise PermanentOperationError(e.detail)
+        raise RuntimeError(e.detail)
+
+operation_worker: Optional[OperationWorker] = OperationWorker(
+    operation_queue,
+    execute_operation,
+    batch_size=api_config.OPERATION_BATCH_SIZE,
+    concurrency=api_config.BATCH_CONCURRENCY,
+    max_attempts=api_config.OPERATION_MAX_ATTEMPTS,
+    retry_base_delay=api_config.OPERATION_RETRY_BASE_DELAY,
+    retry_max_delay=api_config.OPERATION_RETRY_MAX_DELAY,
+    poll_interval=api_config.OPERATION_POLL_INTERVAL_SECONDS,
+    retention_seconds=api_config.OPERATION_RETENTION_SECONDS
+) if operation_queue is not None else None
+
+def prefers_async(
+    prefer: Optional[str] = Header(None, description="Send `respond-async` to queue the change and get 202 with an operation ID.")
+) -> bool:
+    """True if the request asked for asynchronous processing (RFC 7240) and the operation queue is enabled."""
+    if operation_queue is None or not prefer:
+        return False
+    return any(token.split('=')[0].strip().lower() == "respond-async" for token in prefer.replace(';', ',').split(','))
+
+def operation_status(operation: Dict[str, Any]) -> Dict[str, Any]:
+    """Public view of a queued operation."""
+    return {
+        "operation_id": operation['id'],
+        "status": operation['status'],
+        "kind": operation['kind'],
+        "item_name": operation['item_name'],
+        "list_id": operation['list_id'],
+        "attempts": operation['attempts'],
+        "message": operation['message'],
+        "created_at": operation['created_at'],
+        "updated_at": operation['updated_at'],
+    }
+
+def accept_operations(request: Request, account: Account, kind: str, item_names: List[str], list_id: Optional[str] = None) -> Response:
+    """Journals one operation per item name and answers 202 with their IDs (and a Location for a single operation)."""
+    if operation_queue is None or operation_worker is None:
+        # prefers_async() never opts in while the queue is disabled
+        raise RuntimeError("The operation queue is disabled (OPERATION_QUEUE_ENABLED).")
+    operations = [
+        operation_queue.enqueue(account.account_id, kind, name, normalize_item_name(name), list_id)
+        for name in item_names
+    ]
+    operation_worker.notify()
+    logger.info(f"Queued {len(operations)} '{kind}' operation(s) for account '{account.account_id}'.")
+
+    prefix = f"/accounts/{account.account_id}" if "account_id" in request.path_params else ""
+    headers = {"Preference-Applied": "respond-async"}
+    if len(operations) == 1:
+        headers["Location"] = f"{prefix}/operations/{operations[0]['id']}"
+        content = operation_status(operations[0])
+    else:
+        content = {"operations": [operation_status(operation) for operation in operations]}
+    return FastJSONResponse(status_code=202, content=content, headers=headers)
 
 # --- Pydantic Models (for Request Bodies) ---
 class ItemNameModel(BaseModel):
     item_name: str = Field(..., description="The name of the shopping list item.")
 
+class ItemNamesModel(BaseModel):
+    item_names: List[str] = Field(..., min_length=1, description="The names of the shopping list items.")
+
 # Define a Pydantic model for the expected cookie structure (adjust if needed)
 class CookieModel(BaseModel):
     name: str
@@ -136,136 +578,313 @@ async def read_root():
     """Simple health check endpoint."""
     return {"status": "Alexa Shopping List API is running"}
 
-@app.get("/lists", tags=["Lists"], response_model=List[Dict[str, Any]])
-async def get_all_lists():
-    """Retrieves all available shopping lists."""
-    logger.info("Endpoint GET /lists called.")
-    lists = get_all_shopping_lists()
-    if lists is None:
-        logger.error("Failed to retrieve lists from Alexa API.")
-        raise HTTPException(status_code=503, detail="Could not retrieve shopping lists from Alexa.")
-    return lists
-
-@app.get("/lists/{list_id}/items", tags=["Lists"], response_model=List[Dict[str, Any]])
-async def get_list_items_by_id(list_id: str):
-    """Retrieves all items from a specific shopping list by list ID."""
+@app.get("/metrics", tags=["Status"])
+async def get_metrics():
+    """Returns internal counters (e.g. shopping list cache hits/misses), per account where they are kept per account."""
+    return {
+        "list_fetches": list_fetches.stats(),
+        "retries": retry_policy.stats(),
+        "list_mirror": list_mirror.stats() if list_mirror is not None else None,
+        "operations": operation_queue.stats() if operation_queue is not None else None,
+        "idempotency": idempotency_store.stats(),
+        "accounts": {account.account_id: account.stats() for account in accounts.all()}
+    }
+
+# Account-scoped endpoints. The router is mounted twice (see the bottom of this
+# file): at the root, where the account header picks the account, and under
+# /accounts/{account_id}.
+router = APIRouter()
+
+async def embedded_list_snapshots(
+    account: Account,
+    snapshot: ListSnapshot,
+    lists: List[Dict[str, Any]],
+    headers: Dict[str, str]
+) -> List[Optional[ListSnapshot]]:
+    """Fetches the snapshot of every list for embedding its items (None where a list is unavailable)."""
+    if len(lists) == 1:
+        # The default snapshot already holds the only list's items
+        return [snapshot]
+    list_ids = [list_data['listId'] for list_data in lists]
+    if "X-List-Stale" in headers:
+        # Amazon is unreachable; embed the mirrored copies instead
+        return [load_mirrored_snapshot(account, list_id) for list_id in list_ids]
+    return await fetch_list_snapshots(list_ids, account=account)
+
+@router.get("/lists", tags=["Lists"], response_model=List[Dict[str, Any]])
+async def get_all_lists(
+    request: Request,
+    include_items: bool = Query(False, description="Embed each list's items, fetched concurrently."),
+    fields: Optional[str] = Query(None, description="Comma-separated item fields to embed (with include_items)."),
+    account: Account = Depends(get_account)
+):
+    """Retrieves all available shopping lists, optionally with their items."""
+    logger.info(f"Endpoint GET /lists called (include_items={include_items}).")
+    snapshot, headers = await require_list_snapshot(account, detail="Could not retrieve shopping lists from Alexa.")
+    if not include_items:
+        return conditional_json_response(request, snapshot.etag, "lists", lambda: build_lists_from_response(snapshot.response_data), headers)
+
+    lists = build_lists_from_response(snapshot.response_data) or []
+    list_snapshots = await embedded_list_snapshots(account, snapshot, lists, headers)
+    item_fields = parse_item_fields(fields)
+    # Changes whenever any embedded list changes
+    content_tag = hashlib.sha1(
+        "|".join([snapshot.etag] + [s.etag if s else "-" for s in list_snapshots]).encode()
+    ).hexdigest()
+    view = "lists-items" if item_fields is None else f"lists-items-{hashlib.sha1(repr(item_fields).encode()).hexdigest()[:12]}"
+    return conditional_json_response(
+        request, content_tag, view,
+        lambda: [embed_list_items(list_data, s, item_fields) for list_data, s in zip(lists, list_snapshots)],
+        headers
+    )
+
+@router.get("/lists/{list_id}/items", tags=["Lists"], response_model=List[Dict[str, Any]])
+async def get_list_items_by_id(list_id: str, request: Request, params: ItemViewParams = Depends(), account: Account = Depends(get_account)):
+    """Retrieves items from a specific shopping list by list ID."""
     logger.info(f"Endpoint GET /lists/{list_id}/items called.")
-    items = get_shopping_list_items(list_id=list_id)
-    if items is None:
-        logger.error(f"Failed to retrieve items for list {list_id} from Alexa API.")
-        raise HTTPException(status_code=503, detail=f"Could not retrieve items for list {list_id} from Alexa.")
-    return items
-
-@app.get("/items/all", tags=["Items"], response_model=List[Dict[str, Any]])
-async def get_all_list_items():
+    snapshot, headers = await require_list_snapshot(account, list_id)
+    return item_view_response(request, snapshot, "items", None, params, headers)
+
+@router.post("/lists/{list_id}/items", tags=["Lists"], status_code=201)  # 201 Created
+async def add_item_to_list(list_id: str, item_data: ItemNameModel, request: Request, account: Account = Depends(get_account), respond_async: bool = Depends(prefers_async)):
+    """Adds a new item to a specific shopping list by list ID."""
+    item_name = item_data.item_name
+    logger.info(f"Endpoint POST /lists/{list_id}/items called to add: '{item_name}'")
+    if respond_async:
+        return accept_operations(request, account, "add", [item_name], list_id=list_id)
+    return {"message": await apply_item_mutation(account, "add", item_name, list_id=list_id)}
+
+@router.get("/items/all", tags=["Items"], response_model=List[Dict[str, Any]])
+async def get_all_list_items(request: Request, params: ItemViewParams = Depends(), account: Account = Depends(get_account)):
     """Retrieves all items (completed and incomplete) from the default shopping list."""
     logger.info("Endpoint GET /items/all called.")
-    items = get_shopping_list_items()
-    if items is None:
-        logger.error("Failed to retrieve items from Alexa API.")
-        raise HTTPException(status_code=503, detail="Could not retrieve shopping list from Alexa.")
-    return items
+    snapshot, headers = await require_list_snapshot(account)
+    return item_view_response(request, snapshot, "all", None, params, headers)
 
-@app.get("/items/incomplete", tags=["Items"], response_model=List[Dict[str, Any]])
-async def get_incomplete_list_items():
+@router.get("/items/incomplete", tags=["Items"], response_model=List[Dict[str, Any]])
+async def get_incomplete_list_items(request: Request, params: ItemViewParams = Depends(), account: Account = Depends(get_account)):
     """Retrieves only the incomplete items from the shopping list."""
     logger.info("Endpoint GET /items/incomplete called.")
-    all_items = get_shopping_list_items() # No longer needs config passed
-    if all_items is None:
-        logger.error("Failed to retrieve items from Alexa API.")
-        raise HTTPException(status_code=503, detail="Could not retrieve shopping list from Alexa.")
-    incomplete_items = filter_incomplete_items(all_items)
-    return incomplete_items
+    snapshot, headers = await require_list_snapshot(account)
+    return item_view_response(request, snapshot, "incomplete", False, params, headers)
 
-@app.get("/items/completed", tags=["Items"], response_model=List[Dict[str, Any]])
-async def get_completed_list_items():
+@router.get("/items/completed", tags=["Items"], response_model=List[Dict[str, Any]])
+async def get_completed_list_items(request: Request, params: ItemViewParams = Depends(), account: Account = Depends(get_account)):
     """Retrieves only the completed items from the shopping list."""
     logger.info("Endpoint GET /items/completed called.")
-    all_items = get_shopping_list_items() # No longer needs config passed
-    if all_items is None:
-        logger.error("Failed to retrieve items from Alexa API.")
-        raise HTTPException(status_code=503, detail="Could not retrieve shopping list from Alexa.")
-    # Filter completed items directly
-    completed_items = [item for item in all_items if item.get('completed', False)]
-    return completed_items
+    snapshot, headers = await require_list_snapshot(account)
+    return item_view_response(request, snapshot, "completed", True, params, headers)
 
-@app.post("/items", tags=["Items"], status_code=201)  # 201 Created
-async def add_new_item(item_data: ItemNameModel):
+@router.post("/items", tags=["Items"], status_code=201)  # 201 Created
+async def add_new_item(item_data: ItemNameModel, request: Request, account: Account = Depends(get_account), respond_async: bool = Depends(prefers_async)):
     """Adds a new item to the shopping list."""
     item_name = item_data.item_name
     logger.info(f"Endpoint POST /items called to add: '{item_name}'")
-    success = add_shopping_list_item(item_name) # No longer needs config passed
-    if not success:
-        logger.error(f"Failed to add item '{item_name}' via Alexa API.")
-        raise HTTPException(status_code=500, detail=f"Failed to add item '{item_name}'.")
-    return {"message": f"Item '{item_name}' added successfully."}
-
-@app.delete("/items", tags=["Items"])
-async def remove_item(item_data: ItemNameModel):
+    if respond_async:
+        return accept_operations(request, account, "add", [item_name])
+    return {"message": await apply_item_mutation(account, "add", item_name)}
+
+@router.delete("/items", tags=["Items"])
+async def remove_item(item_data: ItemNameModel, request: Request, account: Account = Depends(get_account), respond_async: bool = Depends(prefers_async)):
     """Deletes an item from the shopping list by name (case-insensitive)."""
     item_name = item_data.item_name
     logger.info(f"Endpoint DELETE /items called for: '{item_name}'")
-    all_items = get_shopping_list_items() # No longer needs config passed
-    item_to_delete = find_item_by_name(all_items or [], item_name)
-
-    if not item_to_delete:
-        logger.warning(f"Item '{item_name}' not found for deletion.")
-        raise HTTPException(status_code=404, detail=f"Item '{item_name}' not found.")
-
-    success = delete_shopping_list_item(item_to_delete) # No longer needs config passed
-    if not success:
-        logger.error(f"Failed to delete item '{item_name}' via Alexa API.")
-        raise HTTPException(status_code=500, detail=f"Failed to delete item '{item_name}'.")
-    return {"message": f"Item '{item_name}' deleted successfully."}
+    if respond_async:
+        return accept_operations(request, account, "delete", [item_name])
+    return {"message": await apply_item_mutation(account, "delete", item_name)}
 
-@app.put("/items/mark_completed", tags=["Items"])
-async def mark_item_complete(item_data: ItemNameModel):
+@router.put("/items/mark_completed", tags=["Items"])
+async def mark_item_complete(item_data: ItemNameModel, request: Request, account: Account = Depends(get_account), respond_async: bool = Depends(prefers_async)):
     """Marks an item as completed by name (case-insensitive)."""
     item_name = item_data.item_name
     logger.info(f"Endpoint PUT /items/mark_completed called for: '{item_name}'")
-    all_items = get_shopping_list_items() # No longer needs config passed
-    # Find an *incomplete* item matching the name
-    item_to_mark = find_item_by_name(filter_incomplete_items(all_items or []), item_name)
-
-    if not item_to_mark:
-        logger.warning(f"Incomplete item '{item_name}' not found to mark complete.")
-        raise HTTPException(status_code=404, detail=f"Incomplete item '{item_name}' not found.")
-
-    success = mark_item_as_completed(item_to_mark) # No longer needs config passed
-    if not success:
-        logger.error(f"Failed to mark item '{item_name}' completed via Alexa API.")
-        raise HTTPException(status_code=500, detail=f"Failed to mark item '{item_name}' as completed.")
-    return {"message": f"Item '{item_name}' marked as completed."}
-
-@app.put("/items/mark_incomplete", tags=["Items"])
-async def mark_item_incomplete_endpoint(item_data: ItemNameModel):
+    if respond_async:
+        return accept_operations(request, account, "complete", [item_name])
+    return {"message": await apply_item_mutation(account, "complete", item_name)}
+
+@router.put("/items/mark_incomplete", tags=["Items"])
+async def mark_item_incomplete_endpoint(item_data: ItemNameModel, request: Request, account: Account = Depends(get_account), respond_async: bool = Depends(prefers_async)):
     """Marks an item as incomplete by name (case-insensitive)."""
     item_name = item_data.item_name
     logger.info(f"Endpoint PUT /items/mark_incomplete called for: '{item_name}'")
-    all_items = get_shopping_list_items() # No longer needs config passed
-    # Find a *complete* item matching the name
-    completed_items = [item for item in (all_items or []) if item.get('completed', False)]
-    item_to_mark = find_item_by_name(completed_items, item_name)
-
-    if not item_to_mark:
-        logger.warning(f"Completed item '{item_name}' not found to mark incomplete.")
-        raise HTTPException(status_code=404, detail=f"Completed item '{item_name}' not found.")
-
-    success = unmark_item_as_completed(item_to_mark)  # No longer needs config passed
-    if not success:
-        logger.error(f"Failed to mark item '{item_name}' incomplete via Alexa API.")
-        raise HTTPException(status_code=500, detail=f"Failed to mark item '{item_name}' as incomplete.")
-    return {"message": f"Item '{item_name}' marked as incomplete."}
+    if respond_async:
+        return accept_operations(request, account, "incomplete", [item_name])
+    return {"message": await apply_item_mutation(account, "incomplete", item_name)}
+
+# --- Batch Endpoints ---
+# Each batch fetches the list at most once, resolves every name against that
+# snapshot, then sends the per-item Amazon calls concurrently.
+
+def batch_response(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Wraps per-item batch results with an overall success flag."""
+    return {"success": all(r["success"] for r in results), "results": results}
+
+def set_batch_outcome(result: Dict[str, Any], outcome: Optional[bool], succeeded: str, failed: str) -> None:
+    """Fills in a batch item's result from its gather_bounded outcome (None: not applied, re-authentication needed)."""
+    if outcome is None:
+        result["success"] = False
+        result["message"] = "Not applied: Amazon authentication required. Run login.sh to re-authenticate."
+        result["authentication_required"] = True
+        return
+    result["success"] = outcome
+    result["message"] = succeeded if outcome else failed
+
+def match_batch_items(index: ItemIndex, names: List[Any], completed: Optional[bool]) -> List[Optional[Dict[str, Any]]]:
+    """Resolves each name to the item it acts on (None if there is none), so repeated names get distinct items."""
+    claimed_ids = set()
+    matched: List[Optional[Dict[str, Any]]] = []
+    for name in names:
+        item = None
+        if name:
+            matches = index.match(name, completed=completed, threshold=MUTATION_MATCH_THRESHOLD)
+            item = next((m for m in matches if m.get('id') not in claimed_ids), None)
+        if item is not None:
+            claimed_ids.add(item.get('id'))
+        matched.append(item)
+    return matched
+
+async def run_item_batch(
+    account: Account,
+    item_names: List[str],
+    completed: Optional[bool],
+    operation: Callable[..., Awaitable[bool]],
+    not_found_label: str,
+    success_label: str,
+    failure_label: str
+) -> Dict[str, Any]:
+    """Resolves item names against one list snapshot and applies an operation to each match concurrently."""
+    names = [name.strip() if isinstance(name, str) else name for name in item_names]
+    item_index = await get_current_item_index(
+        account, lambda index: None in match_batch_items(index, [name for name in names if name], completed)
+    )
+    if item_index is None:
+        logger.error("Batch failed: could not retrieve the shopping list.")
+    matched = match_batch_items(item_index, names, completed) if item_index is not None else []
+    claimed_ids = {item.get('id') for item in matched if item is not None}
+    results: List[Dict[str, Any]] = []
+    pending: List[tuple] = []
+
+    for position, name in enumerate(names):
+        if not name:
+            results.append({"item": name, "success": False, "message": "Invalid item name"})
+            continue
+        if item_index is None:
+            # Unknown rather than missing: the list itself could not be fetched
+            results.append({"item": name, "success": False, "message": "Could not retrieve shopping list from Alexa."})
+            continue
+        item = matched[position]
+        if item is None:
+            message = not_found_message(item_index, name, completed, f"{not_found_label} '{name}' not found.", claimed_ids)
+            results.append({"item": name, "success": False, "message": message})
+            continue
+        result = {"item": name}
+        value = item.get('value') or ''
+        if normalize_item_name(value) != normalize_item_name(name):
+            result["matched"] = value
+        results.append(result)
+        pending.append((result, item))
+
+    outcomes = await gather_bounded([lambda item=item: operation(item, account=account) for _, item in pending])
+    for (result, _), outcome in zip(pending, outcomes):
+        set_batch_outcome(
+            result, outcome, f"Item '{result['item']}' {success_label}.", f"Failed to {failure_label} item '{result['item']}'."
+        )
+    return batch_response(results)
+
+# Not-found / success / failure labels per batch mutation kind
+BATCH_MUTATION_LABELS = {
+    "delete": ("Item", "deleted successfully", "delete"),
+    "complete": ("Incomplete item", "marked as completed", "mark as completed"),
+    "incomplete": ("Completed item", "marked as incomplete", "mark as incomplete"),
+}
+
+async def apply_batch_mutation(account: Account, kind: str, item_names: List[str]) -> Dict[str, Any]:
+    """Applies one mutation ("add" or a key of ITEM_MUTATIONS) to several items and returns the per-item results."""
+    if kind != "add":
+        completed, operation = ITEM_MUTATIONS[kind][:2]
+        not_found_label, success_label, failure_label = BATCH_MUTATION_LABELS[kind]
+        return await run_item_batch(
+            account, item_names, completed, operation,
+            not_found_label=not_found_label, success_label=success_label, failure_label=failure_label
+        )
+
+    # Resolve the list ID once up front so the concurrent adds don't each look it up
+    await resolve_primary_list_id(account=account)
+
+    results: List[Dict[str, Any]] = []
+    pending: List[tuple] = []
+    for name in item_names:
+        name = name.strip()
+        if not name:
+            results.append({"item": name, "success": False, "message": "Invalid item name"})
+            continue
+        result = {"item": name}
+        results.append(result)
+        pending.append((result, name))
+
+    outcomes = await gather_bounded([lambda name=name: add_shopping_list_item(name, account=account) for _, name in pending])
+    for (result, name), outcome in zip(pending, outcomes):
+        set_batch_outcome(result, outcome, f"Item '{name}' added successfully.", f"Failed to add item '{name}'.")
+    return batch_response(results)
+
+def accept_batch_operations(request: Request, account: Account, kind: str, item_names: List[str]) -> Response:
+    """Queues one operation per non-blank name of a batch request."""
+    names = [name.strip() for name in item_names if name.strip()]
+    if not names:
+        raise HTTPException(status_code=400, detail="No valid item names given.")
+    return accept_operations(request, account, kind, names)
+
+@router.post("/items/batch", tags=["Items"])
+async def add_items_batch(item_data: ItemNamesModel, request: Request, account: Account = Depends(get_account), respond_async: bool = Depends(prefers_async)):
+    """Adds several items to the shopping list concurrently."""
+    logger.info(f"Endpoint POST /items/batch called for {len(item_data.item_names)} items.")
+    if respond_async:
+        return accept_batch_operations(request, account, "add", item_data.item_names)
+    return await apply_batch_mutation(account, "add", item_data.item_names)
+
+@router.delete("/items/batch", tags=["Items"])
+async def remove_items_batch(item_data: ItemNamesModel, request: Request, account: Account = Depends(get_account), respond_async: bool = Depends(prefers_async)):
+    """Deletes several items by name (case-insensitive) concurrently."""
+    logger.info(f"Endpoint DELETE /items/batch called for {len(item_data.item_names)} items.")
+    if respond_async:
+        return accept_batch_operations(request, account, "delete", item_data.item_names)
+    return await apply_batch_mutation(account, "delete", item_data.item_names)
+
+@router.put("/items/batch/complete", tags=["Items"])
+async def mark_items_complete_batch(item_data: ItemNamesModel, request: Request, account: Account = Depends(get_account), respond_async: bool = Depends(prefers_async)):
+    """Marks several incomplete items as completed by name (case-insensitive) concurrently."""
+    logger.info(f"Endpoint PUT /items/batch/complete called for {len(item_data.item_names)} items.")
+    if respond_async:
+        return accept_batch_operations(request, account, "complete", item_data.item_names)
+    return await apply_batch_mutation(account, "complete", item_data.item_names)
+
+@router.put("/items/batch/incomplete", tags=["Items"])
+async def mark_items_incomplete_batch(item_data: ItemNamesModel, request: Request, account: Account = Depends(get_account), respond_async: bool = Depends(prefers_async)):
+    """Marks several completed items as incomplete by name (case-insensitive) concurrently."""
+    logger.info(f"Endpoint PUT /items/batch/incomplete called for {len(item_data.item_names)} items.")
+    if respond_async:
+        return accept_batch_operations(request, account, "incomplete", item_data.item_names)
+    return await apply_batch_mutation(account, "incomplete", item_data.item_names)
+
+# --- Operations Endpoint ---
+
+@router.get("/operations/{operation_id}", tags=["Items"])
+async def get_operation(operation_id: str, account: Account = Depends(get_account)):
+    """Reports the status of a mutation queued with `Prefer: respond-async`: pending, running, succeeded or failed."""
+    operation = operation_queue.get(operation_id) if operation_queue is not None else None
+    if operation is None or operation['account_id'] != account.account_id:
+        raise HTTPException(status_code=404, detail=f"Operation '{operation_id}' not found.")
+    return operation_status(operation)
 
 # --- Authentication Endpoint ---
-@app.post("/auth/cookies", tags=["Authentication"], status_code=200)
-async def receive_cookies(cookies_data: List[CookieModel]): # Expect a list of CookieModel
-    """Accepts cookies as JSON and saves them to the persistent data volume."""
-    # Use the COOKIE_PATH directly from the local API config
-    cookie_path = api_config.COOKIE_PATH
+@router.post("/auth/cookies", tags=["Authentication"], status_code=200)
+async def receive_cookies(cookies_data: List[CookieModel], account: Account = Depends(get_or_create_account)): # Expect a list of CookieModel
+    """Accepts cookies as JSON and saves them to the persistent data volume, for the selected account."""
+    # The default account uses COOKIE_PATH; others get their own file under ACCOUNTS_DIR
+    cookie_path = account.cookie_store.cookie_file_path
     data_dir_container = os.path.dirname(cookie_path) # Get directory from the path
 
-    logger.info(f"Received {len(cookies_data)} cookies. Attempting to save as JSON to: {cookie_path}")
+    logger.info(f"Received {len(cookies_data)} cookies for account '{account.account_id}'. Attempting to save as JSON to: {cookie_path}")
 
     # Create directory if it doesn't exist
     try:
@@ -283,12 +902,18 @@ async def receive_cookies(cookies_data: List[CookieModel]): # Expect a list of C
             json.dump(cookies_list_of_dicts, f, indent=2)
 
         logger.info(f"Successfully saved cookie data as JSON to {cookie_path}")
+        # Hot-swap the in-memory jar so the next Alexa call uses the new cookies
+        account.cookie_store.replace(cookies_list_of_dicts)
+        account.auth_breaker.reset()
         return {"message": "Cookie data received and saved successfully."}
 
     except Exception as e:
         logger.error(f"Failed to save cookie data as JSON to {cookie_path}: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Failed to save cookie data: {e}")
 
+app.include_router(router)
+app.include_router(router, prefix="/accounts/{account_id}")
+
 # --- Optional: Add main block to run with uvicorn for direct execution ---
 if __name__ == "__main__":
     import uvicorn
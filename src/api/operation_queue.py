@@ -0,0 +1,261 @@
+"""Durable write-behind queue for list mutations.
+
+Mutations are journaled to SQLite and acknowledged immediately; a background
+worker applies them to Amazon later, with retries. Operations on the same item
+(same account and normalized name) are applied strictly in the order they were
+accepted; operations on different items run concurrently.
+"""
+
+import asyncio
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Optional, List, Dict, Any, Callable, Awaitable
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS operations (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT NOT NULL UNIQUE,
+    account_id TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    item_name TEXT NOT NULL,
+    item_key TEXT NOT NULL,
+    list_id TEXT,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    message TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    next_attempt_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS operations_by_status ON operations (status, seq);
+"""
+
+COLUMNS = ('seq', 'id', 'account_id', 'kind', 'item_name', 'item_key', 'list_id', 'status',
+           'attempts', 'message', 'created_at', 'updated_at', 'next_attempt_at')
+
+class PermanentOperationError(Exception):
+    """Raised by an operation executor when retrying cannot help (e.g. the item does not exist)."""
+
+class DeferOperation(Exception):
+    """Raised by an operation executor to retry later without counting an attempt (e.g. cookies expired)."""
+
+class OperationQueue:
+    """SQLite journal of queued operations. Statuses: pending, running, succeeded, failed."""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.db_path) or '.', exist_ok=True)
+            conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(SCHEMA)
+            self._conn = conn
+            logger.info(f"Opened operation queue at {self.db_path}.")
+        return self._conn
+
+    def _rows(self, query: str, params: tuple = ()) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._connection().execute(query, params).fetchall()
+        return [dict(zip(COLUMNS, row)) for row in rows]
+
+    def _execute(self, query: str, params: tuple = ()) -> None:
+        with self._lock:
+            self._connection().execute(query, params)
+
+    def enqueue(self, account_id: str, kind: str, item_name: str, item_key: str, list_id: Optional[str] = None) -> Dict[str, Any]:
+        """Journals a new pending operation and returns it."""
+        now = time.time()
+        operation_id = uuid.uuid4().hex
+        self._execute(
+            "INSERT INTO operations (id, account_id, kind, item_name, item_key, list_id, status, created_at, updated_at, next_attempt_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, 'pending', ?, ?, ?)",
+            (operation_id, account_id, kind, item_name, item_key, list_id, now, now, now)
+        )
+        operation = self.get(operation_id)
+        if operation is None:
+            raise RuntimeError(f"Operation {operation_id} missing right after it was journaled.")
+        return operation
+
+    def get(self, operation_id: str) -> Optional[Dict[str, Any]]:
+        rows = self._rows(f"SELECT {', '.join(COLUMNS)} FROM operations WHERE id = ?", (operation_id,))
+        return rows[0] if rows else None
+
+    def pending(self, limit: int) -> List[Dict[str, Any]]:
+        """Returns pending operations in acceptance order, due or not."""
+        return self._rows(
+            f"SELECT {', '.join(COLUMNS)} FROM operations WHERE status = 'pending' ORDER BY seq LIMIT ?", (limit,)
+        )
+
+    def mark_running(self, operation_id: str) -> bool:
+        """Claims a pending operation; False if it is no longer pending (another pass already took it)."""
+        with self._lock:
+            cursor = self._connection().execute(
+                "UPDATE operations SET status = 'running', updated_at = ? WHERE id = ? AND status = 'pending'",
+                (time.time(), operation_id)
+            )
+        return cursor.rowcount == 1
+
+    def finish(self, operation_id: str, status: str, attempts: int, message: str) -> None:
+        self._execute(
+            "UPDATE operations SET status = ?, attempts = ?, message = ?, updated_at = ? WHERE id = ?",
+            (status, attempts, message, time.time(), operation_id)
+        )
+
+    def reschedule(self, operation_id: str, attempts: int, next_attempt_at: float, message: str) -> None:
+        self._execute(
+            "UPDATE operations SET status = 'pending', attempts = ?, message = ?, updated_at = ?, next_attempt_at = ? WHERE id = ?",
+            (attempts, message, time.time(), next_attempt_at, operation_id)
+        )
+
+    def recover(self) -> int:
+        """Returns operations left running by a previous process to pending (they are applied at least once)."""
+        with self._lock:
+            cursor = self._connection().execute(
+                "UPDATE operations SET status = 'pending', message = 'Interrupted by a restart.' WHERE status = 'running'"
+            )
+        return cursor.rowcount
+
+    def purge(self, finished_before: float) -> None:
+        """Deletes finished operations last updated before the given time."""
+        self._execute(
+            "DELETE FROM operations WHERE status IN ('succeeded', 'failed') AND updated_at < ?", (finished_before,)
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            rows = self._connection().execute("SELECT status, COUNT(*) FROM operations GROUP BY status").fetchall()
+        return {"path": self.db_path, **{status: count for status, count in rows}}
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+class OperationWorker:
+    """Background task that flushes the queue through an executor.
+
+    Each pass takes up to batch_size due operations, skipping any whose item
+    still has an earlier operation pending, and runs them at most concurrency
+    at a time. The executor returns a result message or raises
+    PermanentOperationError, DeferOperation, or anything else for a retryable
+    failure (retried with exponential backoff up to max_attempts).
+    """
+
+    def __init__(
+        self,
+        queue: OperationQueue,
+        execute: Callable[[Dict[str, Any]], Awaitable[str]],
+        batch_size: int,
+        concurrency: int,
+        max_attempts: int,
+        retry_base_delay: float,
+        retry_max_delay: float,
+        poll_interval: float,
+        retention_seconds: float
+    ):
+        self.queue = queue
+        self.execute = execute
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.max_attempts = max_attempts
+        self.retry_base_delay = retry_base_delay
+        self.retry_max_delay = retry_max_delay
+        self.poll_interval = poll_interval
+        self.retention_seconds = retention_seconds
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        recovered = self.queue.recover()
+        if recovered:
+            logger.warning(f"Re-queued {recovered} operations interrupted by a restart.")
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run(self._wakeup))
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def notify(self) -> None:
+        """Wakes the worker after an operation was enqueued."""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def _due_batch(self) -> List[Dict[str, Any]]:
+        now = time.time()
+        blocked = set()
+        batch = []
+        # Look past the batch size so a backed-off operation still blocks later ones on its item
+        for operation in self.queue.pending(self.batch_size * 20):
+            key = (operation['account_id'], operation['item_key'])
+            if key not in blocked and operation['next_attempt_at'] <= now:
+                batch.append(operation)
+            blocked.add(key)
+            if len(batch) >= self.batch_size:
+                break
+        return batch
+
+    async def _run(self, wakeup: asyncio.Event) -> None:
+        semaphore = asyncio.Semaphore(self.concurrency)
+        last_purge = 0.0
+        while True:
+            try:
+                batch = self._due_batch()
+                if batch:
+                    async def run(operation: Dict[str, Any]) -> None:
+                        async with semaphore:
+                            await self._apply(operation)
+                    await asyncio.gather(*(run(operation) for operation in batch))
+                    continue
+                if time.monotonic() - last_purge > 3600:
+                    self.queue.purge(time.time() - self.retention_seconds)
+                    last_purge = time.monotonic()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Operation worker pass failed: {e}", exc_info=True)
+            wakeup.clear()
+            try:
+                await asyncio.wait_for(wakeup.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _apply(self, operation: Dict[str, Any]) -> None:
+        operation_id = operation['id']
+        attempts = operation['attempts'] + 1
+        if not self.queue.mark_running(operation_id):
+            return
+        try:
+            message = await self.execute(operation)
+        except PermanentOperationError as e:
+            logger.warning(f"Operation {operation_id} ({operation['kind']} '{operation['item_name']}') failed: {e}")
+            self.queue.finish(operation_id, 'failed', attempts, str(e))
+        except DeferOperation as e:
+            self.queue.reschedule(operation_id, operation['attempts'], time.time() + self.retry_max_delay, str(e))
+        except Exception as e:
+            if attempts >= self.max_attempts:
+                logger.error(f"Operation {operation_id} ({operation['kind']} '{operation['item_name']}') failed after {attempts} attempts: {e}")
+                self.queue.finish(operation_id, 'failed', attempts, str(e))
+                return
+            delay = min(self.retry_max_delay, self.retry_base_delay * (2 ** (attempts - 1)))
+            logger.warning(f"Operation {operation_id} attempt {attempts} failed ({e}); retrying in {delay:.1f}s")
+            self.queue.reschedule(operation_id, attempts, time.time() + delay, str(e))
+        else:
+            self.queue.finish(operation_id, 'succeeded', attempts, message)
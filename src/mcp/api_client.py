@@ -0,0 +1,165 @@
+"""Pooled HTTP client for the Alexa Shopping List API, shared by both MCP servers.
+
+One long-lived ``requests.Session`` keeps connections to the API container
+alive across tool calls. Reads and writes get separate timeouts, transient
+failures (connection errors, timeouts, 502/503/504) are retried with backoff,
+and unchanged GETs are revalidated with their ETag. Mutations carry an
+Idempotency-Key, so retrying them cannot apply a change twice.
+"""
+
+import logging
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from . import config as mcp_config
+
+logger = logging.getLogger(__name__)
+
+RETRYABLE_STATUS_CODES = frozenset({502, 503, 504})
+
+@dataclass
+class ApiResult:
+    """Outcome of one API call. status_code is None when the API could not be reached."""
+    status_code: Optional[int]
+    data: Any = None
+    error: Optional[str] = None
+    authentication_required: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+class ApiClient:
+    """Thread-safe client for the API server with a pooled session."""
+
+    def __init__(
+        self,
+        base_url: str,
+        pool_maxsize: int,
+        connect_timeout: float,
+        read_timeout: float,
+        write_timeout: float,
+        max_retries: int,
+        retry_backoff: float
+    ):
+        self.base_url = base_url
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.write_timeout = write_timeout
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        # Last ETag and decoded body per GET URL, so unchanged polls are answered with 304 Not Modified
+        self._etag_cache: Dict[str, Tuple[str, Any]] = {}
+        self._etag_lock = threading.Lock()
+
+    def request(
+        self,
+        method: str,
+        endpoint: str,
+        json_data: Optional[Any] = None,
+        timeout: Optional[float] = None,
+        headers: Optional[Dict[str, str]] = None
+    ) -> ApiResult:
+        """Calls an API endpoint and returns its decoded body, or the error, as an ApiResult.
+
+        timeout overrides the read timeout for this call (reads default to
+        read_timeout, mutations to write_timeout).
+        """
+        method = method.upper()
+        url = f"{self.base_url}{endpoint}"
+        request_headers = dict(headers or {})
+        if method == "GET":
+            with self._etag_lock:
+                cached = self._etag_cache.get(url)
+            if cached:
+                request_headers["If-None-Match"] = cached[0]
+        else:
+            cached = None
+            request_headers.setdefault("Idempotency-Key", uuid.uuid4().hex)
+        read_timeout = timeout or (self.read_timeout if method == "GET" else self.write_timeout)
+
+        attempt = 0
+        while True:
+            logger.debug(f"Making {method} request to API: {url}")
+            try:
+                response = self.session.request(
+                    method, url, json=json_data, headers=request_headers,
+                    timeout=(self.connect_timeout, read_timeout)
+                )
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                if attempt < self.max_retries:
+                    attempt += 1
+                    logger.warning(f"{method} {url} failed ({e}); retry {attempt}/{self.max_retries}")
+                    time.sleep(self.retry_backoff * 2 ** (attempt - 1))
+                    continue
+                if isinstance(e, requests.exceptions.Timeout):
+                    logger.error(f"Timeout: {e}")
+                    return ApiResult(None, error=f"Request timeout: {e}")
+                logger.error(f"Connection error: {e}")
+                return ApiResult(None, error=f"Could not connect to Alexa API server at {self.base_url}. Is it running?")
+            except requests.exceptions.RequestException as e:
+                logger.error(f"Error making API request: {e}")
+                return ApiResult(None, error=str(e))
+
+            if response.status_code in RETRYABLE_STATUS_CODES and attempt < self.max_retries:
+                attempt += 1
+                logger.warning(f"{method} {url} returned {response.status_code}; retry {attempt}/{self.max_retries}")
+                time.sleep(self.retry_backoff * 2 ** (attempt - 1))
+                continue
+            return self._result(method, url, response, cached)
+
+    def _result(self, method: str, url: str, response: requests.Response, cached: Optional[Tuple[str, Any]]) -> ApiResult:
+        if response.status_code == 304 and cached:
+            logger.debug(f"Not modified, reusing cached response for {url}")
+            return ApiResult(304, data=cached[1])
+
+        try:
+            body = response.json()
+        except ValueError:
+            body = None
+
+        if response.status_code >= 400:
+            detail = body.get("detail") if isinstance(body, dict) else None
+            error = str(detail) if detail else f"{response.status_code} Error: {response.reason} for url: {url}"
+            logger.error(f"HTTP error: {response.status_code} for {method} {url}: {error}")
+            authentication_required = response.status_code == 401 or (isinstance(body, dict) and bool(body.get("authentication_required")))
+            return ApiResult(response.status_code, error=error, authentication_required=authentication_required)
+
+        if body is None:
+            return ApiResult(response.status_code, data={"message": response.text})
+        etag = response.headers.get("ETag")
+        if method == "GET" and etag:
+            with self._etag_lock:
+                self._etag_cache[url] = (etag, body)
+        return ApiResult(response.status_code, data=body)
+
+    def close(self) -> None:
+        self.session.close()
+
+def create_api_client():
+    """Returns the client for the configured backend (see API_BACKEND in the MCP config)."""
+    if mcp_config.API_BACKEND == "inprocess":
+        # Imported lazily: it loads the whole API server into this process
+        from .local_backend import LocalApiClient
+        return LocalApiClient(read_timeout=mcp_config.API_READ_TIMEOUT, write_timeout=mcp_config.API_WRITE_TIMEOUT)
+    return ApiClient(
+        mcp_config.API_BASE_URL,
+        pool_maxsize=mcp_config.API_POOL_MAXSIZE,
+        connect_timeout=mcp_config.API_CONNECT_TIMEOUT,
+        read_timeout=mcp_config.API_READ_TIMEOUT,
+        write_timeout=mcp_config.API_WRITE_TIMEOUT,
+        max_retries=mcp_config.API_MAX_RETRIES,
+        retry_backoff=mcp_config.API_RETRY_BACKOFF
+    )
+
+api_client = create_api_client()
@@ -10,6 +10,42 @@ LOG_LEVEL = "INFO"
 API_HOST = "localhost"
 API_PORT = 8092
 
+# --- API Client --- #
+# How the MCP servers reach the shopping list API:
+#   "http"      - over HTTP to the API server at API_HOST:API_PORT (default)
+#   "inprocess" - by running the API code inside the MCP server process, which
+#                 skips the HTTP hop. Only for single-host setups: the API's
+#                 requirements must be installed, its config (src/api/config.py,
+#                 e.g. COOKIE_PATH) must suit this host, and no separate API
+#                 server should keep-alive the same cookies.
+API_BACKEND = "http"
+# Keep-alive connections kept open to the API server (shared by all tool calls)
+API_POOL_MAXSIZE = 16
+# Timeouts in seconds: connecting, waiting for reads, waiting for mutations
+# (which may involve several Amazon round-trips)
+API_CONNECT_TIMEOUT = 2.0
+API_READ_TIMEOUT = 10.0
+API_WRITE_TIMEOUT = 20.0
+# Retries for connection errors, timeouts and 502/503/504 from the API, with
+# exponential backoff from this many seconds. Mutations are sent with an
+# Idempotency-Key, so retries never apply them twice.
+API_MAX_RETRIES = 2
+API_RETRY_BACKOFF = 0.25
+
+# Item fields requested from the API's item endpoints; everything else Amazon
+# returns (customerId, listId, timestamps, ...) only costs tokens
+ITEM_FIELDS = "id,value,completed"
+
+# Tool calls the HTTP MCP server runs concurrently (further calls queue); keep
+# API_POOL_MAXSIZE at least this large so each one has a pooled connection
+TOOL_EXECUTOR_WORKERS = 16
+
+# Responses from the HTTP MCP server larger than this many bytes are
+# compressed (brotli when the client accepts it, gzip otherwise)
+RESPONSE_COMPRESSION_MIN_BYTES = 1024
+RESPONSE_BROTLI_QUALITY = 4
+
 # --- Derived --- #
 LOG_LEVEL_INT = getattr(logging, LOG_LEVEL.upper(), logging.INFO)
 API_BASE_URL = f"http://{API_HOST}:{API_PORT}"
+ITEM_FIELDS_QUERY = f"?fields={ITEM_FIELDS}"
@@ -14,18 +14,25 @@ Usage:
   python -m src.mcp.http_mcp_server
 """
 
+import asyncio
 import logging
 import sys
-from typing import Dict, Any, List, Optional, Union
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable, Dict, Any, List, Optional, Tuple, Union
 from fastapi import FastAPI, HTTPException
-from fastapi.responses import JSONResponse
+from brotli_asgi import BrotliMiddleware  # Brotli with gzip fallback
 from pydantic import BaseModel
 import uvicorn
-import requests
 
 # Import local config
 try:
     from . import config as mcp_config
+    from .api_client import api_client
+    from ..api.responses import FastJSONResponse
 except ImportError:
     print("Error: Could not import MCP config", file=sys.stderr)
     sys.exit(1)
@@ -37,124 +44,154 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Tool calls block on the API, so they run on a bounded thread pool instead of
+# the event loop; one slow call then no longer stalls /health, /tools or other
+# tool executions.
+tool_executor = ThreadPoolExecutor(max_workers=mcp_config.TOOL_EXECUTOR_WORKERS, thread_name_prefix="mcp-tool")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    tool_executor.shutdown(wait=False, cancel_futures=True)
+    api_client.close()
+
 # FastAPI app
 app = FastAPI(
     title="Alexa Shopping List MCP Server",
     description="HTTP MCP Server for Alexa Shopping List integration with myndy-brain",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse
+)
+app.add_middleware(
+    BrotliMiddleware,
+    quality=mcp_config.RESPONSE_BROTLI_QUALITY,
+    minimum_size=mcp_config.RESPONSE_COMPRESSION_MIN_BYTES
 )
 
 # API configuration
 API_BASE_URL = mcp_config.API_BASE_URL
 HTTP_SERVER_PORT = 8091  # Different from API port (8000)
 
-# Tool definitions
-TOOLS = [
-    {
-        "name": "get_all_shopping_items",
-        "description": "Retrieves all items currently on the Alexa shopping list, including both active (incomplete) and completed items.",
-        "category": "shopping",
-        "parameters": {
-            "type": "object",
-            "properties": {},
-            "required": []
-        }
-    },
-    {
-        "name": "get_incomplete_shopping_items",
-        "description": "Retrieves only the active (incomplete) items currently on the Alexa shopping list. Useful for seeing what still needs to be purchased.",
-        "category": "shopping",
-        "parameters": {
-            "type": "object",
-            "properties": {},
-            "required": []
-        }
-    },
-    {
-        "name": "get_completed_shopping_items",
-        "description": "Retrieves only the completed items currently on the Alexa shopping list.",
-        "category": "shopping",
-        "parameters": {
-            "type": "object",
-            "properties": {},
-            "required": []
-        }
-    },
-    {
-        "name": "add_shopping_item",
-        "description": "Adds one or more new items to the Alexa shopping list. Input can be a single item name or a list of item names.",
-        "category": "shopping",
-        "parameters": {
-            "type": "object",
-            "properties": {
-                "item_name": {
-                    "type": ["string", "array"],
-                    "description": "Single item name (string) or list of item names (array of strings)",
-                    "items": {"type": "string"}
-                }
-            },
-            "required": ["item_name"]
-        }
-    },
-    {
-        "name": "delete_shopping_item",
-        "description": "Deletes one or more items from the Alexa shopping list by their exact name (case-insensitive).",
-        "category": "shopping",
-        "parameters": {
-            "type": "object",
-            "properties": {
-                "item_name": {
-                    "type": ["string", "array"],
-                    "description": "Single item name (string) or list of item names (array of strings)",
-                    "items": {"type": "string"}
-                }
-            },
-            "required": ["item_name"]
-        }
-    },
-    {
-        "name": "mark_shopping_item_completed",
-        "description": "Marks one or more items on the Alexa shopping list as completed by their exact name (case-insensitive).",
-        "category": "shopping",
-        "parameters": {
-            "type": "object",
-            "properties": {
-                "item_name": {
-                    "type": ["string", "array"],
-                    "description": "Single item name (string) or list of item names (array of strings)",
-                    "items": {"type": "string"}
-                }
-            },
-            "required": ["item_name"]
-        }
-    },
-    {
-        "name": "mark_shopping_item_incomplete",
-        "description": "Marks one or more previously completed items on the Alexa shopping list as incomplete (active). Use this if an item was marked completed by mistake.",
-        "category": "shopping",
-        "parameters": {
-            "type": "object",
-            "properties": {
-                "item_name": {
-                    "type": ["string", "array"],
-                    "description": "Single item name (string) or list of item names (array of strings)",
-                    "items": {"type": "string"}
-                }
-            },
-            "required": ["item_name"]
+# --- Tool Registry ---
+# Tools are handler functions registered with @tool. Each one gets its
+# parameter validator compiled from its JSON schema at import time, so a call
+# is one dict lookup plus the validator; TOOLS and the /tools index are built
+# from the registry once all handlers are defined.
+
+JSON_TYPES = {
+    "string": (str,),
+    "array": (list,),
+    "object": (dict,),
+    "boolean": (bool,),
+    "integer": (int,),
+    "number": (int, float),
+    "null": (type(None),),
+}
+
+Validator = Callable[[Any, str], Optional[str]]
+
+
+def compile_schema(schema: Dict[str, Any]) -> Validator:
+    """Compiles the JSON schema subset used by tool parameters (type, properties, required, items).
+
+    The returned function takes a value and its path and returns an error
+    message, or None when the value is valid.
+    """
+    checks: List[Validator] = []
+
+    if "type" in schema:
+        type_names = schema["type"] if isinstance(schema["type"], list) else [schema["type"]]
+        python_types = tuple(t for name in type_names for t in JSON_TYPES[name])
+        allows_bool = "boolean" in type_names  # bool is an int subclass
+        expected = " or ".join(type_names)
+
+        def check_type(value, path):
+            if not isinstance(value, python_types) or (isinstance(value, bool) and not allows_bool):
+                return f"Invalid parameter {path}: expected {expected}"
+        checks.append(check_type)
+
+    required = list(schema.get("required", []))
+    properties = {name: compile_schema(sub) for name, sub in schema.get("properties", {}).items()}
+    if required or properties:
+        def check_object(value, path):
+            if not isinstance(value, dict):
+                return None
+            for name in required:
+                if name not in value:
+                    return f"Missing required parameter: {f'{path}.{name}' if path else name}"
+            for name, validate in properties.items():
+                if name in value:
+                    error = validate(value[name], f"{path}.{name}" if path else name)
+                    if error:
+                        return error
+        checks.append(check_object)
+
+    if "items" in schema:
+        validate_item = compile_schema(schema["items"])
+
+        def check_items(value, path):
+            if not isinstance(value, list):
+                return None
+            for i, item in enumerate(value):
+                error = validate_item(item, f"{path}[{i}]")
+                if error:
+                    return error
+        checks.append(check_items)
+
+    def validate(value, path=""):
+        for check in checks:
+            error = check(value, path)
+            if error:
+                return error
+        return None
+    return validate
+
+
+# A handler takes the validated parameters and returns (success, output, error)
+ToolHandler = Callable[[Dict[str, Any]], Tuple[bool, Any, Optional[str]]]
+
+
+@dataclass
+class RegisteredTool:
+    definition: Dict[str, Any]
+    handler: ToolHandler
+    validate: Validator
+
+
+TOOL_REGISTRY: Dict[str, RegisteredTool] = {}
+
+NO_PARAMETERS = {
+    "type": "object",
+    "properties": {},
+    "required": []
+}
+
+ITEM_NAME_PARAMETERS = {
+    "type": "object",
+    "properties": {
+        "item_name": {
+            "type": ["string", "array"],
+            "description": "Single item name (string) or list of item names (array of strings)",
+            "items": {"type": "string"}
         }
     },
-    {
-        "name": "check_alexa_auth_status",
-        "description": "Checks if Alexa Shopping List authentication is valid. Returns authentication status and instructions if re-authentication is needed.",
-        "category": "shopping",
-        "parameters": {
-            "type": "object",
-            "properties": {},
-            "required": []
+    "required": ["item_name"]
+}
+
+
+def tool(name: str, description: str, parameters: Dict[str, Any] = NO_PARAMETERS, category: str = "shopping"):
+    """Registers the decorated function as the handler of a tool"""
+    def decorator(handler: ToolHandler) -> ToolHandler:
+        definition = {
+            "name": name,
+            "description": description,
+            "category": category,
+            "parameters": parameters
         }
-    }
-]
+        TOOL_REGISTRY[name] = RegisteredTool(definition, handler, compile_schema(parameters))
+        return handler
+    return decorator
 
 
 class ToolExecuteRequest(BaseModel):
@@ -165,308 +202,259 @@ class ToolExecuteRequest(BaseModel):
 
 
 def make_api_request(method: str, endpoint: str, json_data: Optional[Dict] = None) -> Dict:
-    """Makes a request to the Alexa API server"""
-    url = f"{API_BASE_URL}{endpoint}"
-    logger.debug(f"Making {method} request to API: {url}")
+    """Makes a request to the Alexa API server through the shared pooled client"""
+    result = api_client.request(method, endpoint, json_data)
+    if result.ok:
+        return result.data
+    error = result.error or "Unknown error"
+
+    # Enhanced error message for authentication failures
+    if result.authentication_required:
+        return {
+            "error": "Amazon authentication expired. Please re-authenticate.",
+            "authentication_required": True,
+            "instructions": "To re-authenticate:\n1. Open terminal\n2. Run: cd ~/Alexa-Shopping-List && ./login.sh\n3. Log in to Amazon when browser opens\n4. Press Enter after successful login\n\nNote: Amazon cookies expire periodically and require manual browser login."
+        }
+    elif result.status_code is not None and ("Could not retrieve shopping list" in error or "shopping list" in error.lower()):
+        return {
+            "error": "Cannot access Alexa shopping list - authentication may have expired.",
+            "authentication_required": True,
+            "instructions": "To re-authenticate:\n1. Open terminal\n2. Run: cd ~/Alexa-Shopping-List && ./login.sh\n3. Log in to Amazon when browser opens\n4. Press Enter after successful login"
+        }
 
-    try:
-        if method.upper() == "GET":
-            response = requests.get(url, timeout=10)
-        elif method.upper() == "POST":
-            response = requests.post(url, json=json_data, timeout=10)
-        elif method.upper() == "PUT":
-            response = requests.put(url, json=json_data, timeout=10)
-        elif method.upper() == "DELETE":
-            response = requests.delete(url, json=json_data, timeout=10)
+    return {"error": error}
+
+
+def item_error_message(api_result: Dict) -> str:
+    """Error text of a failed API call, with re-authentication instructions when they apply"""
+    message = api_result.get("error", "Unknown result")
+    if api_result.get("authentication_required"):
+        message = f"{message}\n\n{api_result.get('instructions', '')}"
+    return message
+
+
+def run_item_tool(item_name: Any, method: str, endpoint: str, batch_endpoint: str) -> List[Dict[str, Any]]:
+    """Applies an item tool to one name or a list of names and returns the per-item results.
+
+    Several names go to the API's batch endpoint in a single request, which
+    resolves them against one list fetch and applies them concurrently.
+    """
+    item_names = [item_name] if isinstance(item_name, str) else item_name
+    results: List[Dict[str, Any]] = []
+    valid: List[Dict[str, Any]] = []
+    for name in item_names:
+        if not isinstance(name, str) or not name.strip():
+            results.append({"item": name, "success": False, "message": "Invalid item name"})
+            continue
+        result = {"item": name.strip()}
+        results.append(result)
+        valid.append(result)
+
+    if len(valid) == 1:
+        api_result = make_api_request(method, endpoint, {"item_name": valid[0]["item"]})
+        valid[0]["success"] = "error" not in api_result
+        valid[0]["message"] = api_result.get("message", "Unknown result") if valid[0]["success"] else item_error_message(api_result)
+    elif valid:
+        api_result = make_api_request(method, batch_endpoint, {"item_names": [r["item"] for r in valid]})
+        batch_results = api_result.get("results") if "error" not in api_result else None
+        if not isinstance(batch_results, list) or len(batch_results) != len(valid):
+            message = item_error_message(api_result) if "error" in api_result else "Unexpected API response format"
+            for result in valid:
+                result.update(success=False, message=message)
         else:
-            return {"error": f"Unsupported HTTP method: {method}"}
-
-        response.raise_for_status()
-
-        try:
-            return response.json()
-        except ValueError:
-            return {"message": response.text}
-
-    except requests.exceptions.ConnectionError as e:
-        logger.error(f"Connection error: {e}")
-        return {"error": f"Could not connect to Alexa API server at {API_BASE_URL}. Is it running?"}
-    except requests.exceptions.HTTPError as e:
-        logger.error(f"HTTP error: {e}")
-        try:
-            error_detail = response.json().get("detail", str(e))
-        except (ValueError, AttributeError):
-            error_detail = str(e)
-
-        # Enhanced error message for authentication failures
-        if response.status_code == 401 or "Unauthorized" in str(e) or "401" in str(e):
-            return {
-                "error": "Amazon authentication expired. Please re-authenticate.",
-                "authentication_required": True,
-                "instructions": "To re-authenticate:\n1. Open terminal\n2. Run: cd ~/Alexa-Shopping-List && ./login.sh\n3. Log in to Amazon when browser opens\n4. Press Enter after successful login\n\nNote: Amazon cookies expire periodically and require manual browser login."
-            }
-        elif "Could not retrieve shopping list" in error_detail or "shopping list" in error_detail.lower():
-            return {
-                "error": "Cannot access Alexa shopping list - authentication may have expired.",
-                "authentication_required": True,
-                "instructions": "To re-authenticate:\n1. Open terminal\n2. Run: cd ~/Alexa-Shopping-List && ./login.sh\n3. Log in to Amazon when browser opens\n4. Press Enter after successful login"
-            }
-
-        return {"error": error_detail}
-    except requests.exceptions.Timeout as e:
-        logger.error(f"Timeout: {e}")
-        return {"error": f"Request timeout: {str(e)}"}
-    except Exception as e:
-        logger.error(f"Error making API request: {e}")
-        return {"error": str(e)}
+            for result, batch_result in zip(valid, batch_results):
+                result.update(batch_result, item=result["item"])
+    return results
+
+
+# --- Tools ---
+
+def item_list_result(view: str) -> Tuple[bool, Any, Optional[str]]:
+    """Fetches one of the API's item views (all, incomplete, completed)"""
+    result = make_api_request("GET", f"/items/{view}{mcp_config.ITEM_FIELDS_QUERY}")
+    if "error" not in result:
+        return True, result, None
+
+    # Include authentication instructions if auth failed
+    error = result.get("error")
+    if result.get("authentication_required"):
+        error = f"{error}\n\n{result.get('instructions', '')}"
+    return False, result, error
+
+
+def item_tool_result(parameters: Dict[str, Any], method: str, endpoint: str, batch_endpoint: str, failure: str) -> Tuple[bool, Any, Optional[str]]:
+    """Runs an item_name tool and summarizes its per-item results"""
+    item_name = parameters["item_name"]
+    if not item_name:
+        return False, None, "Missing required parameter: item_name"
+
+    results = run_item_tool(item_name, method, endpoint, batch_endpoint)
+    success = all(r["success"] for r in results)
+    return success, {"results": results}, None if success else failure
+
+
+@tool(
+    "get_all_shopping_items",
+    "Retrieves all items currently on the Alexa shopping list, including both active (incomplete) and completed items."
+)
+def get_all_shopping_items(parameters: Dict[str, Any]):
+    return item_list_result("all")
+
+
+@tool(
+    "get_incomplete_shopping_items",
+    "Retrieves only the active (incomplete) items currently on the Alexa shopping list. Useful for seeing what still needs to be purchased."
+)
+def get_incomplete_shopping_items(parameters: Dict[str, Any]):
+    return item_list_result("incomplete")
+
+
+@tool(
+    "get_completed_shopping_items",
+    "Retrieves only the completed items currently on the Alexa shopping list."
+)
+def get_completed_shopping_items(parameters: Dict[str, Any]):
+    return item_list_result("completed")
+
+
+@tool(
+    "add_shopping_item",
+    "Adds one or more new items to the Alexa shopping list. Input can be a single item name or a list of item names.",
+    ITEM_NAME_PARAMETERS
+)
+def add_shopping_item(parameters: Dict[str, Any]):
+    return item_tool_result(
+        parameters, "POST", "/items", "/items/batch",
+        "Some items failed to add. Check individual results for details."
+    )
+
+
+@tool(
+    "delete_shopping_item",
+    "Deletes one or more items from the Alexa shopping list by their exact name (case-insensitive).",
+    ITEM_NAME_PARAMETERS
+)
+def delete_shopping_item(parameters: Dict[str, Any]):
+    return item_tool_result(parameters, "DELETE", "/items", "/items/batch", "Some items failed to delete")
+
+
+@tool(
+    "mark_shopping_item_completed",
+    "Marks one or more items on the Alexa shopping list as completed by their exact name (case-insensitive).",
+    ITEM_NAME_PARAMETERS
+)
+def mark_shopping_item_completed(parameters: Dict[str, Any]):
+    return item_tool_result(
+        parameters, "PUT", "/items/mark_completed", "/items/batch/complete",
+        "Some items failed to mark as completed"
+    )
+
+
+@tool(
+    "mark_shopping_item_incomplete",
+    "Marks one or more previously completed items on the Alexa shopping list as incomplete (active). Use this if an item was marked completed by mistake.",
+    ITEM_NAME_PARAMETERS
+)
+def mark_shopping_item_incomplete(parameters: Dict[str, Any]):
+    return item_tool_result(
+        parameters, "PUT", "/items/mark_incomplete", "/items/batch/incomplete",
+        "Some items failed to mark as incomplete"
+    )
+
+
+@tool(
+    "check_alexa_auth_status",
+    "Checks if Alexa Shopping List authentication is valid. Returns authentication status and instructions if re-authentication is needed."
+)
+def check_alexa_auth_status(parameters: Dict[str, Any]):
+    # Try to fetch items to test authentication
+    result = make_api_request("GET", f"/items/incomplete{mcp_config.ITEM_FIELDS_QUERY}")
+
+    if "error" in result:
+        error_msg = str(result.get("error", ""))
+        if "401" in error_msg or "Unauthorized" in error_msg or "expired" in error_msg.lower():
+            # Authentication expired; the tool itself succeeded
+            return True, {
+                "authenticated": False,
+                "status": "expired",
+                "message": "Amazon authentication has expired. Re-authentication required.",
+                "instructions": "To re-authenticate:\n1. Open terminal\n2. Run: cd ~/Alexa-Shopping-List && ./login.sh\n3. Log in to Amazon when browser opens\n4. Press Enter after successful login\n\nNote: Amazon cookies expire periodically and require manual re-authentication."
+            }, None
+        # Other error (API not running, etc.)
+        return False, {
+            "authenticated": "unknown",
+            "status": "error",
+            "message": f"Could not check authentication status: {error_msg}"
+        }, error_msg
+
+    if isinstance(result, list):
+        # Successfully got items - authentication is valid
+        return True, {
+            "authenticated": True,
+            "status": "valid",
+            "message": "Amazon authentication is valid and working.",
+            "items_count": len(result)
+        }, None
+
+    # Unexpected response
+    return False, {
+        "authenticated": "unknown",
+        "status": "unexpected_response",
+        "message": "Received unexpected response from API"
+    }, "Unexpected API response format"
+
+
+# Tool definitions, in registration order
+TOOLS = [registered.definition for registered in TOOL_REGISTRY.values()]
+
+# /tools filter index: tools per category and the lowercased text searched
+TOOLS_BY_CATEGORY: Dict[str, List[Dict[str, Any]]] = {}
+for _definition in TOOLS:
+    TOOLS_BY_CATEGORY.setdefault(_definition["category"], []).append(_definition)
+TOOL_SEARCH_TEXT = {definition["name"]: (definition["name"].lower(), definition["description"].lower()) for definition in TOOLS}
+
+
+@lru_cache(maxsize=256)
+def filter_tools(category: Optional[str], search: Optional[str]) -> Tuple[Dict[str, Any], ...]:
+    """Tools matching a category and a case-insensitive name/description search; results are memoized"""
+    tools = TOOLS_BY_CATEGORY.get(category, []) if category else TOOLS
+    if search:
+        tools = [t for t in tools if any(search in text for text in TOOL_SEARCH_TEXT[t["name"]])]
+    return tuple(tools)
 
 
 def execute_tool_logic(tool_name: str, parameters: Dict[str, Any]) -> Dict[str, Any]:
     """Execute a tool and return the result"""
-    import time
     start_time = time.time()
 
-    try:
-        # Route to appropriate API endpoint based on tool name
-        if tool_name == "get_all_shopping_items":
-            result = make_api_request("GET", "/items/all")
-            success = "error" not in result
-            output = result if isinstance(result, list) else result
-            error = result.get("error") if not success else None
-
-            # Include authentication instructions if auth failed
-            if not success and result.get("authentication_required"):
-                error = f"{error}\n\n{result.get('instructions', '')}"
-
-        elif tool_name == "get_incomplete_shopping_items":
-            result = make_api_request("GET", "/items/incomplete")
-            success = "error" not in result
-            output = result if isinstance(result, list) else result
-            error = result.get("error") if not success else None
-
-            # Include authentication instructions if auth failed
-            if not success and result.get("authentication_required"):
-                error = f"{error}\n\n{result.get('instructions', '')}"
-
-        elif tool_name == "get_completed_shopping_items":
-            result = make_api_request("GET", "/items/completed")
-            success = "error" not in result
-            output = result if isinstance(result, list) else result
-            error = result.get("error") if not success else None
-
-            # Include authentication instructions if auth failed
-            if not success and result.get("authentication_required"):
-                error = f"{error}\n\n{result.get('instructions', '')}"
-
-        elif tool_name == "add_shopping_item":
-            item_name = parameters.get("item_name")
-            if not item_name:
-                return {
-                    "success": False,
-                    "output": None,
-                    "error": "Missing required parameter: item_name"
-                }
-
-            # Handle single item or list
-            item_names = [item_name] if isinstance(item_name, str) else item_name
-            results = []
-            all_succeeded = True
-
-            for name in item_names:
-                if not isinstance(name, str) or not name.strip():
-                    results.append({"item": name, "success": False, "message": "Invalid item name"})
-                    all_succeeded = False
-                    continue
-
-                api_result = make_api_request("POST", "/items", {"item_name": name.strip()})
-                item_success = "error" not in api_result
-
-                # Enhanced error message with auth instructions if needed
-                message = api_result.get("message", api_result.get("error", "Unknown result"))
-                if not item_success and api_result.get("authentication_required"):
-                    message = f"{message}\n\n{api_result.get('instructions', '')}"
-
-                results.append({
-                    "item": name.strip(),
-                    "success": item_success,
-                    "message": message
-                })
-                if not item_success:
-                    all_succeeded = False
-
-            success = all_succeeded
-            output = {"results": results}
-            error = None if success else "Some items failed to add. Check individual results for details."
-
-        elif tool_name == "delete_shopping_item":
-            item_name = parameters.get("item_name")
-            if not item_name:
-                return {
-                    "success": False,
-                    "output": None,
-                    "error": "Missing required parameter: item_name"
-                }
-
-            item_names = [item_name] if isinstance(item_name, str) else item_name
-            results = []
-            all_succeeded = True
-
-            for name in item_names:
-                if not isinstance(name, str) or not name.strip():
-                    results.append({"item": name, "success": False, "message": "Invalid item name"})
-                    all_succeeded = False
-                    continue
-
-                api_result = make_api_request("DELETE", "/items", {"item_name": name.strip()})
-                item_success = "error" not in api_result
-                results.append({
-                    "item": name.strip(),
-                    "success": item_success,
-                    "message": api_result.get("message", api_result.get("error", "Unknown result"))
-                })
-                if not item_success:
-                    all_succeeded = False
-
-            success = all_succeeded
-            output = {"results": results}
-            error = None if success else "Some items failed to delete"
-
-        elif tool_name == "mark_shopping_item_completed":
-            item_name = parameters.get("item_name")
-            if not item_name:
-                return {
-                    "success": False,
-                    "output": None,
-                    "error": "Missing required parameter: item_name"
-                }
-
-            item_names = [item_name] if isinstance(item_name, str) else item_name
-            results = []
-            all_succeeded = True
-
-            for name in item_names:
-                if not isinstance(name, str) or not name.strip():
-                    results.append({"item": name, "success": False, "message": "Invalid item name"})
-                    all_succeeded = False
-                    continue
-
-                api_result = make_api_request("PUT", "/items/mark_completed", {"item_name": name.strip()})
-                item_success = "error" not in api_result
-                results.append({
-                    "item": name.strip(),
-                    "success": item_success,
-                    "message": api_result.get("message", api_result.get("error", "Unknown result"))
-                })
-                if not item_success:
-                    all_succeeded = False
-
-            success = all_succeeded
-            output = {"results": results}
-            error = None if success else "Some items failed to mark as completed"
-
-        elif tool_name == "mark_shopping_item_incomplete":
-            item_name = parameters.get("item_name")
-            if not item_name:
-                return {
-                    "success": False,
-                    "output": None,
-                    "error": "Missing required parameter: item_name"
-                }
-
-            item_names = [item_name] if isinstance(item_name, str) else item_name
-            results = []
-            all_succeeded = True
-
-            for name in item_names:
-                if not isinstance(name, str) or not name.strip():
-                    results.append({"item": name, "success": False, "message": "Invalid item name"})
-                    all_succeeded = False
-                    continue
-
-                api_result = make_api_request("PUT", "/items/mark_incomplete", {"item_name": name.strip()})
-                item_success = "error" not in api_result
-                results.append({
-                    "item": name.strip(),
-                    "success": item_success,
-                    "message": api_result.get("message", api_result.get("error", "Unknown result"))
-                })
-                if not item_success:
-                    all_succeeded = False
-
-            success = all_succeeded
-            output = {"results": results}
-            error = None if success else "Some items failed to mark as incomplete"
-
-        elif tool_name == "check_alexa_auth_status":
-            # Try to fetch items to test authentication
-            result = make_api_request("GET", "/items/incomplete")
-
-            if "error" in result:
-                error_msg = str(result.get("error", ""))
-                if "401" in error_msg or "Unauthorized" in error_msg or "expired" in error_msg.lower():
-                    # Authentication expired
-                    success = True  # Tool succeeded, but auth is invalid
-                    output = {
-                        "authenticated": False,
-                        "status": "expired",
-                        "message": "Amazon authentication has expired. Re-authentication required.",
-                        "instructions": "To re-authenticate:\n1. Open terminal\n2. Run: cd ~/Alexa-Shopping-List && ./login.sh\n3. Log in to Amazon when browser opens\n4. Press Enter after successful login\n\nNote: Amazon cookies expire periodically and require manual re-authentication."
-                    }
-                    error = None
-                else:
-                    # Other error (API not running, etc.)
-                    success = False
-                    output = {
-                        "authenticated": "unknown",
-                        "status": "error",
-                        "message": f"Could not check authentication status: {error_msg}"
-                    }
-                    error = error_msg
-            elif isinstance(result, list):
-                # Successfully got items - authentication is valid
-                success = True
-                output = {
-                    "authenticated": True,
-                    "status": "valid",
-                    "message": "Amazon authentication is valid and working.",
-                    "items_count": len(result)
-                }
-                error = None
-            else:
-                # Unexpected response
-                success = False
-                output = {
-                    "authenticated": "unknown",
-                    "status": "unexpected_response",
-                    "message": "Received unexpected response from API"
-                }
-                error = "Unexpected API response format"
-
-        else:
-            return {
-                "success": False,
-                "output": None,
-                "error": f"Unknown tool: {tool_name}"
-            }
-
-        execution_time = time.time() - start_time
+    registered = TOOL_REGISTRY.get(tool_name)
+    if registered is None:
         return {
-            "success": success,
-            "output": output,
-            "error": error,
-            "execution_time": execution_time
+            "success": False,
+            "output": None,
+            "error": f"Unknown tool: {tool_name}"
         }
-
-    except Exception as e:
-        logger.exception(f"Error executing tool {tool_name}: {e}")
-        execution_time = time.time() - start_time
+    error = registered.validate(parameters, "")
+    if error:
         return {
             "success": False,
             "output": None,
-            "error": str(e),
-            "execution_time": execution_time
+            "error": error
         }
 
+    try:
+        success, output, error = registered.handler(parameters)
+    except Exception as e:
+        logger.exception(f"Error executing tool {tool_name}: {e}")
+        success, output, error = False, None, str(e)
+
+    return {
+        "success": success,
+        "output": output,
+        "error": error,
+        "execution_time": time.time() - start_time
+    }
+
 
 # HTTP Endpoints
 
@@ -475,7 +463,8 @@ async def health_check():
     """Health check endpoint"""
     # Check if API server is accessible
     try:
-        api_response = make_api_request("GET", "/")
+        # Default thread pool, so the check never waits behind queued tool calls
+        api_response = await asyncio.to_thread(make_api_request, "GET", "/")
         api_accessible = "error" not in api_response
     except Exception:
         api_accessible = False
@@ -486,7 +475,7 @@ async def health_check():
         "status": status,
         "service": "alexa-shopping-list-mcp",
         "api_server": {
-            "url": API_BASE_URL,
+            "url": api_client.base_url,
             "accessible": api_accessible
         }
     }
@@ -499,22 +488,7 @@ async def list_tools(
     search: Optional[str] = None
 ):
     """List available tools"""
-    tools = TOOLS.copy()
-
-    # Filter by category
-    if category:
-        tools = [t for t in tools if t.get("category") == category]
-
-    # Filter by search
-    if search:
-        search_lower = search.lower()
-        tools = [
-            t for t in tools
-            if search_lower in t["name"].lower() or search_lower in t["description"].lower()
-        ]
-
-    # Apply limit
-    tools = tools[:limit]
+    tools = list(filter_tools(category, search.lower() if search else None)[:limit])
 
     return {
         "tools": tools,
@@ -528,18 +502,18 @@ async def execute_tool(request: ToolExecuteRequest):
     logger.info(f"Executing tool: {request.tool_name}")
     logger.debug(f"Parameters: {request.parameters}")
 
-    # Find tool
-    tool = next((t for t in TOOLS if t["name"] == request.tool_name), None)
-    if not tool:
+    if request.tool_name not in TOOL_REGISTRY:
         raise HTTPException(status_code=404, detail=f"Tool not found: {request.tool_name}")
 
-    # Execute tool
-    result = execute_tool_logic(request.tool_name, request.parameters)
+    # Execute tool off the event loop
+    loop = asyncio.get_running_loop()
+    result = await loop.run_in_executor(tool_executor, execute_tool_logic, request.tool_name, request.parameters)
 
-    return {
+    # Returned directly so the (possibly large) item list skips jsonable_encoder
+    return FastJSONResponse({
         "tool_name": request.tool_name,
         "result": result
-    }
+    })
 
 
 @app.get("/")
@@ -548,14 +522,14 @@ async def root():
     return {
         "service": "Alexa Shopping List MCP Server",
         "version": "1.0.0",
-        "api_server": API_BASE_URL,
+        "api_server": api_client.base_url,
         "tools_count": len(TOOLS)
     }
 
 
 if __name__ == "__main__":
     logger.info(f"Starting HTTP MCP Server on port {HTTP_SERVER_PORT}")
-    logger.info(f"API Server: {API_BASE_URL}")
+    logger.info(f"API Server: {api_client.base_url}")
 
     uvicorn.run(
         app,
@@ -0,0 +1,195 @@
+"""In-process backend for the MCP servers (API_BACKEND = "inprocess").
+
+Serves the same API calls as ApiClient, but by calling the API server's own
+endpoint helpers directly instead of going through HTTP: no localhost round
+trip and no JSON encode/decode of list data. The API's lifespan (keep-alive
+job, operation queue worker) runs on a private event loop thread, which also
+owns the async Amazon clients and list caches.
+
+Results and errors match the HTTP path: HTTPException details and status
+codes, 401 with authentication_required for expired cookies, 404 for unknown
+routes.
+"""
+
+import asyncio
+import logging
+import re
+import threading
+import concurrent.futures
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from fastapi import HTTPException
+from pydantic import TypeAdapter, ValidationError
+
+from .api_client import ApiResult
+from ..api import main as api_main
+
+logger = logging.getLogger(__name__)
+
+Handler = Callable[..., Awaitable[Any]]
+
+# Same lax parsing FastAPI applies to bool query parameters (true/false, 1/0, yes/no, on/off, ...)
+_bool_adapter = TypeAdapter(bool)
+
+def _query_value(query: Dict[str, List[str]], name: str) -> Optional[str]:
+    values = query.get(name)
+    return values[-1] if values else None
+
+def _query_bool(query: Dict[str, List[str]], name: str, default: bool) -> bool:
+    value = _query_value(query, name)
+    if value is None:
+        return default
+    try:
+        return _bool_adapter.validate_python(value)
+    except ValidationError:
+        raise HTTPException(status_code=422, detail=f"Invalid {name}: {value}")
+
+def _item_view_params(query: Dict[str, List[str]]) -> "api_main.ItemViewParams":
+    """Builds ItemViewParams from a query string, validating like the HTTP endpoints do."""
+    sort = _query_value(query, "sort")
+    if sort is not None and sort.lstrip('-') not in api_main.ITEM_SORT_KEYS:
+        raise HTTPException(status_code=422, detail=f"Invalid sort: {sort}")
+    limit = _query_value(query, "limit")
+    if limit is not None:
+        if not limit.isdigit() or not 1 <= int(limit) <= api_main.api_config.ITEMS_MAX_PAGE_SIZE:
+            raise HTTPException(status_code=422, detail=f"Invalid limit: {limit}")
+        limit = int(limit)
+    return api_main.ItemViewParams(
+        fields=_query_value(query, "fields"), sort=sort, limit=limit, cursor=_query_value(query, "cursor")
+    )
+
+# --- Route Handlers ---
+# Each mirrors the endpoint of the same name in src/api/main.py.
+
+async def _root(account, query, body):
+    return await api_main.read_root()
+
+async def _get_lists(account, query, body):
+    include_items = _query_bool(query, "include_items", False)
+    snapshot, headers = await api_main.require_list_snapshot(account, detail="Could not retrieve shopping lists from Alexa.")
+    lists = api_main.build_lists_from_response(snapshot.response_data) or []
+    if not include_items:
+        return lists
+    list_snapshots = await api_main.embedded_list_snapshots(account, snapshot, lists, headers)
+    item_fields = api_main.parse_item_fields(_query_value(query, "fields"))
+    return [api_main.embed_list_items(list_data, s, item_fields) for list_data, s in zip(lists, list_snapshots)]
+
+def _item_view(completed: Optional[bool]) -> Handler:
+    async def handler(account, query, body, list_id=None):
+        snapshot, _ = await api_main.require_list_snapshot(account, list_id)
+        page, _ = api_main.item_view_page(snapshot, completed, _item_view_params(query))
+        return page
+    return handler
+
+def _mutation(kind: str) -> Handler:
+    async def handler(account, query, body, list_id=None):
+        item_name = body.get("item_name") if isinstance(body, dict) else None
+        if not isinstance(item_name, str):
+            raise HTTPException(status_code=422, detail="item_name is required.")
+        return {"message": await api_main.apply_item_mutation(account, kind, item_name, list_id=list_id)}
+    return handler
+
+def _batch_mutation(kind: str) -> Handler:
+    async def handler(account, query, body):
+        item_names = body.get("item_names") if isinstance(body, dict) else None
+        if not isinstance(item_names, list) or not item_names or not all(isinstance(n, str) for n in item_names):
+            raise HTTPException(status_code=422, detail="item_names must be a non-empty list of strings.")
+        return await api_main.apply_batch_mutation(account, kind, item_names)
+    return handler
+
+# (method, path, handler, success status code of the HTTP endpoint)
+ROUTES: List[Tuple[str, "re.Pattern", Handler, int]] = [
+    ("GET", re.compile(r"/"), _root, 200),
+    ("GET", re.compile(r"/lists"), _get_lists, 200),
+    ("GET", re.compile(r"/lists/(?P<list_id>[^/]+)/items"), _item_view(None), 200),
+    ("POST", re.compile(r"/lists/(?P<list_id>[^/]+)/items"), _mutation("add"), 201),
+    ("GET", re.compile(r"/items/all"), _item_view(None), 200),
+    ("GET", re.compile(r"/items/incomplete"), _item_view(False), 200),
+    ("GET", re.compile(r"/items/completed"), _item_view(True), 200),
+    ("POST", re.compile(r"/items/batch"), _batch_mutation("add"), 200),
+    ("DELETE", re.compile(r"/items/batch"), _batch_mutation("delete"), 200),
+    ("PUT", re.compile(r"/items/batch/complete"), _batch_mutation("complete"), 200),
+    ("PUT", re.compile(r"/items/batch/incomplete"), _batch_mutation("incomplete"), 200),
+    ("POST", re.compile(r"/items"), _mutation("add"), 201),
+    ("DELETE", re.compile(r"/items"), _mutation("delete"), 200),
+    ("PUT", re.compile(r"/items/mark_completed"), _mutation("complete"), 200),
+    ("PUT", re.compile(r"/items/mark_incomplete"), _mutation("incomplete"), 200),
+]
+
+class LocalApiClient:
+    """Drop-in replacement for ApiClient that calls the API code in this process."""
+
+    def __init__(self, read_timeout: float, write_timeout: float):
+        self.base_url = "inprocess"
+        self.read_timeout = read_timeout
+        self.write_timeout = write_timeout
+        self._loop = asyncio.new_event_loop()
+        self._lifespan = None
+        self._closed = False
+        self._started = threading.Event()
+        threading.Thread(target=self._run_loop, name="mcp-inprocess-api", daemon=True).start()
+        self._started.wait()
+        asyncio.run_coroutine_threadsafe(self._start(), self._loop).result()
+
+    def _run_loop(self) -> None:
+        asyncio.set_event_loop(self._loop)
+        self._loop.call_soon(self._started.set)
+        self._loop.run_forever()
+
+    async def _start(self) -> None:
+        self._lifespan = api_main.lifespan(api_main.app)
+        await self._lifespan.__aenter__()
+        logger.info("In-process API backend started.")
+
+    async def _dispatch(self, method: str, endpoint: str, body: Any) -> ApiResult:
+        parts = urlsplit(endpoint)
+        query = parse_qs(parts.query)
+        account = api_main.accounts.default
+        for route_method, pattern, handler, status_code in ROUTES:
+            match = pattern.fullmatch(parts.path)
+            if route_method == method and match:
+                break
+        else:
+            return ApiResult(404, error="Not Found")
+        try:
+            return ApiResult(status_code, data=await handler(account, query, body, **match.groupdict()))
+        except HTTPException as e:
+            logger.error(f"HTTP error: {e.status_code} for {method} {endpoint}: {e.detail}")
+            return ApiResult(e.status_code, error=str(e.detail))
+        except api_main.AuthenticationRequiredError as e:
+            logger.warning(f"{method} {parts.path} failed: {e}")
+            return ApiResult(401, error=f"{e} Run login.sh to re-authenticate.", authentication_required=True)
+        except api_main.UnknownAccountError as e:
+            return ApiResult(404, error=f"{e} Upload cookies for it first.")
+        except Exception as e:
+            logger.exception(f"Error handling {method} {endpoint} in process: {e}")
+            return ApiResult(500, error="Internal Server Error")
+
+    def request(
+        self,
+        method: str,
+        endpoint: str,
+        json_data: Optional[Any] = None,
+        timeout: Optional[float] = None,
+        headers: Optional[Dict[str, str]] = None
+    ) -> ApiResult:
+        """Same contract as ApiClient.request."""
+        method = method.upper()
+        future = asyncio.run_coroutine_threadsafe(self._dispatch(method, endpoint, json_data), self._loop)
+        try:
+            return future.result(timeout or (self.read_timeout if method == "GET" else self.write_timeout))
+        except concurrent.futures.TimeoutError:
+            logger.error(f"Timeout: {method} {endpoint}")
+            return ApiResult(None, error=f"Request timeout: {method} {endpoint}")
+
+    def close(self) -> None:
+        """Runs the API's shutdown (scheduler, queue worker, clients, cookie flush) and stops the loop."""
+        if self._closed:
+            return
+        self._closed = True
+        async def shutdown():
+            if self._lifespan is not None:
+                await self._lifespan.__aexit__(None, None, None)
+        asyncio.run_coroutine_threadsafe(shutdown(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
@@ -2,8 +2,6 @@
 import sys
 import os
 import logging
-import requests  # For making API calls
-import json
 from typing import List, Dict, Any, Optional, Union
 from pathlib import Path
 
@@ -18,6 +16,7 @@ from pathlib import Path
 # Import the local config
 try:
     from . import config as mcp_config
+    from .api_client import api_client
 except ImportError as e:
     print(f"Error importing local MCP config: {e}", file=sys.stderr)
     print("Ensure you are running from the project root or have activated the correct environment.", file=sys.stderr)
@@ -38,7 +37,7 @@ logger = logging.getLogger(__name__)
 # Use base URL directly from local config
 API_BASE_URL = mcp_config.API_BASE_URL
 
-logger.info(f"MCP Server configured to connect to API at: {mcp_config.API_BASE_URL}")
+logger.info(f"MCP Server configured to connect to API at: {api_client.base_url}")
 
 # Suppress noisy library logs based on loaded config
 if mcp_config.LOG_LEVEL_INT > logging.DEBUG:
@@ -55,66 +54,36 @@ print("--- DEBUG: FastMCP server instance created.", file=sys.stderr)
 
 # --- Helper Functions ---
 def make_api_request(method: str, endpoint: str, json_data: Optional[Dict] = None) -> Dict:
-    """Makes a request to the FastAPI server and handles errors."""
-    url = f"{API_BASE_URL}{endpoint}"
-    logger.debug(f"Making {method} request to FastAPI: {url}")
-
-    try:
-        if method.upper() == "GET":
-            response = requests.get(url)
-        elif method.upper() == "POST":
-            response = requests.post(url, json=json_data)
-        elif method.upper() == "PUT":
-            response = requests.put(url, json=json_data)
-        elif method.upper() == "DELETE":
-            response = requests.delete(url, json=json_data)
-        else:
-            logger.error(f"Unsupported HTTP method: {method}")
-            return {"error": f"Unsupported HTTP method: {method}"}
-
-        # Raise exception for 4xx/5xx status codes
-        response.raise_for_status()
-
-        # Try to parse JSON, fall back to text if not JSON
-        try:
-            return response.json()
-        except json.JSONDecodeError:
-            return {"message": response.text}
-
-    except requests.exceptions.ConnectionError:
-        logger.error(f"Connection error: Could not connect to FastAPI server at {API_BASE_URL}")
+    """Makes a request to the FastAPI server through the shared pooled client and handles errors."""
+    result = api_client.request(method, endpoint, json_data)
+    if result.status_code is None and "Could not connect" in (result.error or ""):
         return {"error": "Could not connect to FastAPI server. Is it running?"}
-    except requests.exceptions.HTTPError as e:
-        logger.error(f"HTTP error: {e}")
-        # Try to get error details from the response
-        try:
-            error_detail = response.json().get("detail", str(e))
-        except (json.JSONDecodeError, AttributeError):
-            error_detail = str(e)
-        return {"error": error_detail}
-    except Exception as e:
-        logger.error(f"Error making API request: {e}")
-        return {"error": str(e)}
+    if not result.ok:
+        return {"error": result.error}
+    return result.data
 
 # --- Tool Definitions ---
 # These now proxy requests to our FastAPI server
 
 @mcp.tool()
-def get_all_shopping_lists() -> list[dict]:
+def get_all_shopping_lists(include_items: bool = False) -> list[dict]:
     """
-    Retrieves all available Alexa shopping lists.
+    Retrieves all available Alexa shopping lists, optionally with the items on each one.
     Returns a list of dictionaries, where each dictionary represents a list and includes:
     - listId: Unique identifier for the list
     - name: Name of the list (e.g., "Shopping List", "To-Do List")
     - isPrimary: True for the main "Shopping List"
     - itemCount, incompleteCount, completedCount: Item statistics
+    - items: The list's items ('id', 'value', 'completed'), only when include_items is true
 
+    Set include_items to answer "what's on all my lists" in a single call.
     The primary "Shopping List" will always be returned first.
     This is useful for discovering what lists are available before retrieving items from a specific list.
     An empty list is returned if no lists are found or an error occurs.
     """
-    logger.info("Tool 'get_all_shopping_lists' called.")
-    response = make_api_request("GET", "/lists")
+    logger.info(f"Tool 'get_all_shopping_lists' called (include_items={include_items}).")
+    endpoint = f"/lists?include_items=true&fields={mcp_config.ITEM_FIELDS}" if include_items else "/lists"
+    response = make_api_request("GET", endpoint)
 
     if "error" in response:
         logger.error(f"Error in get_all_shopping_lists: {response['error']}")
@@ -132,11 +101,11 @@ def get_items_from_list(list_id: str) -> list[dict]:
     """
     Retrieves all items from a specific Alexa shopping list by its list ID.
     Use get_all_shopping_lists() first to discover available list IDs.
-    Returns a list of dictionaries, where each dictionary represents an item and includes keys like 'id', 'value', 'listId', and 'completed'.
+    Returns a list of dictionaries, where each dictionary represents an item and includes the keys 'id', 'value', and 'completed'.
     An empty list is returned if the list is empty or an error occurs.
     """
     logger.info(f"Tool 'get_items_from_list' called with list_id: {list_id}")
-    response = make_api_request("GET", f"/lists/{list_id}/items")
+    response = make_api_request("GET", f"/lists/{list_id}/items{mcp_config.ITEM_FIELDS_QUERY}")
 
     if "error" in response:
         logger.error(f"Error in get_items_from_list for list {list_id}: {response['error']}")
@@ -159,7 +128,7 @@ def get_all_items() -> list[dict]:
     Note: This retrieves items from the main Shopping List. Use get_items_from_list(list_id) to access other lists.
     """
     logger.info("Tool 'get_all_items' called.")
-    response = make_api_request("GET", "/items/all")
+    response = make_api_request("GET", f"/items/all{mcp_config.ITEM_FIELDS_QUERY}")
 
     if "error" in response:
         logger.error(f"Error in get_all_items: {response['error']}")
@@ -181,7 +150,7 @@ def get_incomplete_items() -> list[dict]:
     An empty list is returned if there are no active items or an error occurs.
     """
     logger.info("Tool 'get_incomplete_items' called.")
-    response = make_api_request("GET", "/items/incomplete")
+    response = make_api_request("GET", f"/items/incomplete{mcp_config.ITEM_FIELDS_QUERY}")
 
     if "error" in response:
         logger.error(f"Error in get_incomplete_items: {response['error']}")
@@ -203,7 +172,7 @@ def get_completed_items() -> list[dict]:
     An empty list is returned if there are no completed items or an error occurs.
     """
     logger.info("Tool 'get_completed_items' called.")
-    response = make_api_request("GET", "/items/completed")
+    response = make_api_request("GET", f"/items/completed{mcp_config.ITEM_FIELDS_QUERY}")
 
     if "error" in response:
         logger.error(f"Error in get_completed_items: {response['error']}")
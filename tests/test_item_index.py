@@ -0,0 +1,29 @@
+"""Name matching in ItemIndex for names that fold to nothing."""
+
+import unittest
+
+from src.api.alexa_api import ItemIndex
+
+
+def item(item_id, value):
+    return {"id": item_id, "value": value, "completed": False}
+
+
+class SymbolOnlyNameTest(unittest.TestCase):
+
+    def setUp(self):
+        self.index = ItemIndex([item("1", "🍎"), item("2", "!!!"), item("3", "milk")])
+
+    def test_emoji_only_names_match_exactly(self):
+        self.assertEqual(self.index.match("🍎", threshold=1.0), [self.index.find("🍎")])
+        self.assertEqual(self.index.match("🍌", threshold=1.0), [])
+        self.assertEqual(self.index.match("🍌"), [])
+
+    def test_punctuation_only_names_match_exactly(self):
+        self.assertEqual([i["id"] for i in self.index.match("!!!", threshold=1.0)], ["2"])
+        self.assertEqual(self.index.match("&", threshold=1.0), [])
+        self.assertEqual(self.index.match("?!"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+"""Retry behaviour of queued mutations (Prefer: respond-async) when Amazon is unavailable or slow."""
+
+import os
+import tempfile
+import time
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from src.api import main
+from src.api.alexa_api import ItemIndex
+from src.api.operation_queue import OperationQueue, OperationWorker
+
+
+def snapshot(items, cached=False):
+    """Stands in for a ListSnapshot served from the cache or fetched during the lookup."""
+    return SimpleNamespace(fetched_at=time.time() + (-20 if cached else 1), index=ItemIndex(items))
+
+
+class QueuedOperationTest(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.queue = OperationQueue(os.path.join(self.tmp.name, "operations.sqlite3"))
+        self.worker = OperationWorker(
+            self.queue,
+            main.execute_operation,
+            batch_size=10,
+            concurrency=1,
+            max_attempts=5,
+            retry_base_delay=60.0,
+            retry_max_delay=300.0,
+            poll_interval=1.0,
+            retention_seconds=3600.0
+        )
+
+    def tearDown(self):
+        self.queue.close()
+        self.tmp.cleanup()
+
+    async def apply_delete(self, *snapshots):
+        """Applies a queued delete of 'bread' while list fetches return the given snapshots in turn."""
+        operation = self.queue.enqueue(main.accounts.default.account_id, "delete", "bread", "bread")
+        with mock.patch.object(main, "fetch_list_snapshot", mock.AsyncMock(side_effect=snapshots)) as fetch:
+            await self.worker._apply(operation)
+        self.fetches = fetch.call_args_list
+        applied = self.queue.get(operation['id'])
+        assert applied is not None
+        return applied
+
+    async def test_list_fetch_failure_is_retried(self):
+        # fetch_list_snapshot returns None when the list could not be fetched (e.g. Amazon answered 503)
+        operation = await self.apply_delete(None)
+        self.assertEqual(operation['status'], 'pending')
+        self.assertEqual(operation['attempts'], 1)
+        self.assertIn("Could not retrieve shopping list", operation['message'])
+
+    async def test_missing_item_fails_permanently(self):
+        operation = await self.apply_delete(snapshot([{"id": "1", "value": "milk", "completed": False}]))
+        self.assertEqual(operation['status'], 'failed')
+        self.assertEqual(operation['message'], "Item 'bread' not found.")
+        self.assertEqual(len(self.fetches), 1)  # A fresh fetch is not refetched
+
+    async def test_cached_miss_is_refetched(self):
+        # The cached list predates 'bread' being added from an Echo
+        cached = snapshot([{"id": "1", "value": "milk", "completed": False}], cached=True)
+        fresh = snapshot([{"id": "1", "value": "milk", "completed": False}, {"id": "2", "value": "bread", "completed": False}])
+        delete = mock.AsyncMock(return_value=True)
+        with mock.patch.dict(main.ITEM_MUTATIONS, delete=(None, delete, *main.ITEM_MUTATIONS["delete"][2:])):
+            operation = await self.apply_delete(cached, fresh)
+        self.assertEqual(operation['status'], 'succeeded')
+        self.assertEqual(self.fetches[1].kwargs.get('use_cache'), False)
+        self.assertEqual(delete.await_args_list[0].args[0]['id'], "2")
+
+
+    async def test_ambiguous_add_is_not_resent(self):
+        amazon_items = []
+
+        async def add(item_name, account=None):
+            # Amazon adds the item, but the response times out, so the call reports failure
+            amazon_items.append({"id": str(len(amazon_items) + 1), "value": item_name, "completed": False})
+            return False
+
+        async def fetch(list_id=None, use_cache=True, account=None):
+            return snapshot(list(amazon_items))
+
+        operation = self.queue.enqueue(main.accounts.default.account_id, "add", "tea", "tea")
+        with mock.patch.object(main, "add_shopping_list_item", side_effect=add), \
+                mock.patch.object(main, "fetch_list_snapshot", side_effect=fetch):
+            for _ in range(self.worker.max_attempts):
+                current = self.queue.get(operation['id'])
+                assert current is not None
+                if current['status'] != 'pending':
+                    break
+                await self.worker._apply(current)
+        self.assertEqual([item['value'] for item in amazon_items], ["tea"])
+        current = self.queue.get(operation['id'])
+        assert current is not None
+        self.assertEqual(current['status'], 'succeeded')
+        self.assertEqual(current['attempts'], 2)
+
+    def test_operation_is_claimed_once(self):
+        operation = self.queue.enqueue(main.accounts.default.account_id, "delete", "bread", "bread")
+        self.assertTrue(self.queue.mark_running(operation['id']))
+        self.assertFalse(self.queue.mark_running(operation['id']))
+
+
+if __name__ == "__main__":
+    unittest.main()